@@ -0,0 +1,216 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from dijkstra_graph import Graph
+from hash_bench import make_keys, print_table
+from hash_functions import siphash_hash
+from hash_table import HashTable
+from search_strategies import binary_search, run_search
+from shortest_paths import ShortestPathTreeCache
+from sort_engine import selection_sort
+from tsp_core import node_name
+from tsp_graph import Graph as TSPGraph
+
+
+# Every case is setup(n, rng) -> state, built before any timing starts, and
+# run(state, rng), one timed operation. Sizes are the defaults of a sweep.
+
+def setup_sort(n, rng):
+    return [rng.randint(1, 100) for _ in range(n)]
+
+
+def run_sort(values, rng):
+    selection_sort(values)
+
+
+def setup_search(n, rng):
+    return sorted(rng.sample(range(10 * n), n))
+
+
+def run_binary_search(values, rng):
+    run_search(binary_search, values, rng.randrange(10 * len(values)))
+
+
+def setup_hash_table(n, rng):
+    # The page's default char-sum hash puts most of these keys in a few
+    # chains; siphash measures the table itself, as hash_bench does
+    table = HashTable(8, siphash_hash)
+    keys = make_keys(n)
+    for i, key in enumerate(keys):
+        table.insert(key, i)
+    return table, keys
+
+
+def run_hash_get(state, rng):
+    table, keys = state
+    table.get(keys[rng.randrange(len(keys))])
+
+
+def run_hash_insert(state, rng):
+    # Overwrites an existing key, so the table keeps its size across runs
+    table, keys = state
+    table.insert(keys[rng.randrange(len(keys))], rng.random())
+
+
+def setup_tsp(n, rng):
+    # Complete graph with random weights, as the page generates; each run
+    # includes building the distance matrix from the edge dicts
+    graph = TSPGraph()
+    names = [node_name(i) for i in range(n)]
+    for name in names:
+        graph.add_node(name)
+    for i in range(n):
+        for j in range(i + 1, n):
+            graph.add_edge(names[i], names[j], rng.randint(1, 10))
+    return graph, names
+
+
+def run_nearest_neighbor(state, rng):
+    graph, names = state
+    graph.nearest_neighbor_tsp(rng.choice(names))
+
+
+def setup_graph(n, rng):
+    # Ring through every node plus three random edges per node, like the
+    # page's random graphs at a larger scale; the tree cache is turned off so
+    # every query is a full search
+    graph = Graph()
+    names = [str(i) for i in range(n)]
+    for name in names:
+        graph.add_node(name)
+    for i in range(n):
+        graph.add_edge(names[i], names[(i + 1) % n], rng.randint(1, 10))
+        for _ in range(3):
+            graph.add_edge(names[i], names[rng.randrange(n)], rng.randint(1, 10))
+    graph.trees = ShortestPathTreeCache(max_trees=0)
+    graph.get_csr()
+    return graph, names
+
+
+def run_dijkstra(state, rng):
+    graph, names = state
+    graph.dijkstra(rng.choice(names), rng.choice(names))
+
+
+CASES = {
+    "selection_sort": (setup_sort, run_sort, (100, 1000, 10000)),
+    "binary_search": (setup_search, run_binary_search, (1000, 100000, 1000000)),
+    "HashTable.get": (setup_hash_table, run_hash_get, (1000, 10000, 100000)),
+    "HashTable.insert": (setup_hash_table, run_hash_insert, (1000, 10000, 100000)),
+    "nearest_neighbor_tsp": (setup_tsp, run_nearest_neighbor, (10, 100, 500)),
+    "Graph.dijkstra": (setup_graph, run_dijkstra, (100, 1000, 10000)),
+}
+
+
+def peak_memory(run, state, rng):
+    # Peak bytes allocated during one operation, measured apart from the
+    # timed runs because tracing slows everything down
+    tracemalloc.start()
+    try:
+        run(state, rng)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(cases=None, sizes=None, repeats=50, seed=0, memory=True):
+    # One row per (algorithm, size): throughput, latency percentiles and
+    # peak memory of `repeats` single operations after one warm-up
+    results = []
+    for name in cases or CASES:
+        setup, run, default_sizes = CASES[name]
+        for n in sizes or default_sizes:
+            rng = random.Random(seed)
+            state = setup(n, rng)
+            run(state, rng)
+            latencies = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                run(state, rng)
+                latencies.append(time.perf_counter() - start)
+            latencies = np.array(latencies)
+            row = {
+                "algorithm": name,
+                "size": n,
+                "ops/sec": repeats / latencies.sum() if latencies.sum() else float('inf'),
+                "p50 ms": float(np.percentile(latencies, 50)) * 1000,
+                "p99 ms": float(np.percentile(latencies, 99)) * 1000,
+            }
+            if memory:
+                row["peak bytes"] = peak_memory(run, state, rng)
+            results.append(row)
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare_results(baseline, results, tolerance=0.2):
+    # Rows present in both runs with their throughput ratio; a ratio below
+    # 1 - tolerance is flagged as a regression
+    old = {(row["algorithm"], row["size"]): row for row in baseline}
+    rows = []
+    for row in results:
+        before = old.get((row["algorithm"], row["size"]))
+        if before is None:
+            continue
+        ratio = row["ops/sec"] / before["ops/sec"] if before["ops/sec"] else float('inf')
+        rows.append({
+            "algorithm": row["algorithm"],
+            "size": row["size"],
+            "baseline ops/sec": before["ops/sec"],
+            "ops/sec": row["ops/sec"],
+            "ratio": ratio,
+            "status": "REGRESSION" if ratio < 1 - tolerance else "ok",
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the algorithm cores over a sweep of input sizes")
+    parser.add_argument("--algorithms", nargs="+", choices=list(CASES), help="default: all")
+    parser.add_argument("--sizes", type=int, nargs="+", help="override every algorithm's default sizes")
+    parser.add_argument("--repeats", type=int, default=50, help="timed operations per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="throughput drop counted as a regression (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.algorithms, args.sizes, args.repeats, args.seed, memory=not args.no_memory)
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "repeats": args.repeats, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare_results(json.load(f)["results"], results, args.tolerance)
+        if comparison:
+            print()
+            print_table(comparison)
+        regressions = [row for row in comparison if row["status"] == "REGRESSION"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
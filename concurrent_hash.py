@@ -0,0 +1,168 @@
+import threading
+
+from hash_backends import SlotsChainedHashTable, SlotsNode
+from hash_functions import siphash_hash
+
+
+class StripedHashTable:
+    # Chained table shared between threads. Writers lock one stripe (a fixed
+    # group of buckets); readers take no lock at all. That is safe because a
+    # chain is only ever changed by a single reference assignment (new head,
+    # unlinked node, new value), and a resize builds fresh chains and then
+    # swaps the whole bucket list in one step.
+    def __init__(self, size=64, hash_fn=siphash_hash, stripes=16, max_load_factor=1.0):
+        self.table = [None] * size
+        self.hash_fn = hash_fn
+        self.max_load_factor = max_load_factor
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.counts = [0] * stripes
+        self.waits = [0] * stripes
+        self.acquisitions = [0] * stripes
+        self._resize_lock = threading.Lock()
+
+    @property
+    def size(self):
+        return len(self.table)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    @property
+    def contention(self):
+        # Fraction of lock acquisitions that found the stripe already held
+        acquired = sum(self.acquisitions)
+        return sum(self.waits) / acquired if acquired else 0.0
+
+    def _lock(self, stripe):
+        lock = self.locks[stripe]
+        if not lock.acquire(blocking=False):
+            lock.acquire()
+            self.waits[stripe] += 1
+        self.acquisitions[stripe] += 1
+        return lock
+
+    def _locked_bucket(self, key):
+        # Locks the stripe of key's bucket, retrying if a resize swapped the table meanwhile
+        h = self.hash_fn(key)
+        while True:
+            table = self.table
+            index = h % len(table)
+            stripe = index % len(self.locks)
+            lock = self._lock(stripe)
+            if table is self.table:
+                return table, index, stripe, lock
+            lock.release()
+
+    def insert(self, key, value):
+        table, index, stripe, lock = self._locked_bucket(key)
+        try:
+            current = table[index]
+            while current:
+                if current.key == key:
+                    current.value = value
+                    return
+                current = current.next
+            table[index] = SlotsNode(key, value, table[index])
+            self.counts[stripe] += 1
+        finally:
+            lock.release()
+        if self.count > self.size * self.max_load_factor:
+            self._resize(self.size * 2)
+
+    def get(self, key):
+        table = self.table
+        current = table[self.hash_fn(key) % len(table)]
+        while current:
+            if current.key == key:
+                return current.value
+            current = current.next
+        return None
+
+    def delete(self, key):
+        table, index, stripe, lock = self._locked_bucket(key)
+        try:
+            prev, current = None, table[index]
+            while current:
+                if current.key == key:
+                    if prev:
+                        prev.next = current.next
+                    else:
+                        table[index] = current.next
+                    self.counts[stripe] -= 1
+                    return
+                prev, current = current, current.next
+        finally:
+            lock.release()
+
+    def items(self):
+        for head in self.table:
+            current = head
+            while current:
+                yield current.key, current.value
+                current = current.next
+
+    def _resize(self, new_size):
+        with self._resize_lock:
+            if self.size >= new_size:
+                return
+            for lock in self.locks:
+                lock.acquire()
+            try:
+                # Copy the nodes so lock-free readers still walking the old
+                # chains never see them relinked
+                table = [None] * new_size
+                counts = [0] * len(self.locks)
+                for key, value in self.items():
+                    index = self.hash_fn(key) % new_size
+                    table[index] = SlotsNode(key, value, table[index])
+                    counts[index % len(self.locks)] += 1
+                self.table = table
+                self.counts = counts
+            finally:
+                for lock in self.locks:
+                    lock.release()
+
+
+class GlobalLockHashTable:
+    # Baseline for the benchmark: every operation, reads included, takes one lock
+    def __init__(self, size=64, hash_fn=siphash_hash):
+        self.inner = SlotsChainedHashTable(size, hash_fn)
+        self.lock = threading.Lock()
+        self.waits = 0
+        self.acquisitions = 0
+
+    @property
+    def count(self):
+        return self.inner.count
+
+    @property
+    def contention(self):
+        return self.waits / self.acquisitions if self.acquisitions else 0.0
+
+    def _lock(self):
+        if not self.lock.acquire(blocking=False):
+            self.lock.acquire()
+            self.waits += 1
+        self.acquisitions += 1
+
+    def insert(self, key, value):
+        self._lock()
+        try:
+            self.inner.insert(key, value)
+        finally:
+            self.lock.release()
+
+    def get(self, key):
+        self._lock()
+        try:
+            return self.inner.get(key)
+        finally:
+            self.lock.release()
+
+    def delete(self, key):
+        self._lock()
+        try:
+            self.inner.delete(key)
+        finally:
+            self.lock.release()
@@ -2,134 +2,188 @@ import streamlit as st
 import random
 from graphviz import Digraph
 import io
-from queue import PriorityQueue
-
-class Node:
-    def __init__(self, name):
-        self.name = name
-        self.visited = False
-        self.current = False
-        self.distance = float('inf')
-        self.previous = None
-
-class Graph:
-    def __init__(self):
-        self.nodes = {}
-        self.edges = {}
-
-    def add_node(self, name):
-        self.nodes[name] = Node(name)
-
-    def add_edge(self, start, end, weight):
-        if start not in self.edges:
-            self.edges[start] = {}
-        self.edges[start][end] = weight
-
-    def get_graphviz(self, bg_color, box_color, default_color, visited_color, current_color, path_color, zoom_level, path=None):
-        dot = Digraph(comment='Dijkstra\'s Algorithm Visualization')
-        dot.attr(engine='neato')
-        
-        width, height = 22 * zoom_level, 17 * zoom_level
-        size = f"{width},{height}"
-        dot.attr(rankdir='LR', bgcolor=bg_color, size=size, dpi="60")
-        
-        with dot.subgraph(name='cluster_bg') as c:
-            c.attr(style='filled,rounded', color=box_color, fillcolor=box_color, penwidth='2')
-            c.attr(label='', fontcolor="#00000000")
-
-        node_size = max(0.3, 0.8 / zoom_level)
-        dot.attr('node', shape='circle', style='filled', fontcolor='black', fontname='Arial', 
-                 fontsize=str(max(10, int(20 / zoom_level))), width=str(node_size), height=str(node_size), fixedsize='true')
-        
-        edge_len = max(1.0, 2.0 * zoom_level)
-        dot.attr('edge', fontname='Arial', fontsize=str(max(8, int(16 / zoom_level))), len=str(edge_len))
-
-        for name, node in self.nodes.items():
-            if path and name in path:
-                dot.node(name, name, fillcolor=path_color)
-            elif node.visited:
-                dot.node(name, name, fillcolor=visited_color)
-            elif node.current:
-                dot.node(name, name, fillcolor=current_color, penwidth='3')
+import os
+import re
+import time
+from render_pool import await_render, get_render_pool, session_slot, show_graph
+from graph_csr import load_graph_file, random_csr, random_grid_csr
+from shortest_paths import MODES, HEURISTICS, run_query, compare_modes
+from landmarks import LandmarkIndex
+from distance_matrix import distance_matrix, matrix_csv, matrix_npy
+from dijkstra_graph import create_random_graph
+
+@st.cache_resource
+def load_large_graph(path, mtime, undirected):
+    # mtime is part of the cache key so an edited file is parsed again
+    return load_graph_file(path, undirected)
+
+@st.cache_resource
+def load_landmark_index(directory, mtime):
+    # Memory-mapped, so a saved index of any size is ready at once
+    return LandmarkIndex.load(directory)
+
+def get_landmark_index(graph, directory):
+    # The index built this session, else one saved for this exact graph
+    index = st.session_state.get("landmark_index")
+    if index is not None and index.matches(graph):
+        return index
+    meta = os.path.join(directory, 'landmarks.json')
+    if os.path.exists(meta):
+        index = load_landmark_index(directory, os.path.getmtime(meta))
+        if index.matches(graph):
+            return index
+    return None
+
+def get_neighborhood_graphviz(graph, path, path_color, limit=150):
+    nodes, edges = graph.neighborhood(path[:limit], limit)
+    on_path = set(zip(path, path[1:]))
+    dot = Digraph(comment='Shortest Path Neighborhood', engine='neato')
+    dot.attr('node', shape='circle', style='filled', fontname='Arial', fontsize='10')
+    path_nodes = set(path)
+    for u in nodes:
+        dot.node(str(u), str(u), fillcolor=path_color if u in path_nodes else '#e6f3ff')
+    for u, v, w in edges:
+        if (u, v) in on_path:
+            dot.edge(str(u), str(v), label=str(w), color=path_color, penwidth='3')
+        else:
+            dot.edge(str(u), str(v), label=str(w), color='#A9A9A9')
+    return dot
+
+def parse_node_ids(text, num_nodes):
+    ids = [int(token) for token in re.findall(r'\d+', text)]
+    return [i for i in ids if i < num_nodes]
+
+def show_distance_matrix(graph):
+    st.header("Distance Matrix")
+    st.caption("Node ids separated by spaces or commas; leave a box empty for random nodes.")
+    col1, col2 = st.columns(2)
+    sources = parse_node_ids(col1.text_area("Matrix Sources"), graph.num_nodes)
+    targets = parse_node_ids(col2.text_area("Matrix Targets"), graph.num_nodes)
+    col1, col2 = st.columns(2)
+    random_count = int(col1.number_input("Random Nodes per Empty Box", 1, 10000, 100))
+    workers = int(col2.number_input("Worker Processes", 1, 256, os.cpu_count() or 1))
+    if st.button("Compute Distance Matrix"):
+        rng = random.Random()
+        sources = sources or [rng.randrange(graph.num_nodes) for _ in range(random_count)]
+        targets = targets or [rng.randrange(graph.num_nodes) for _ in range(random_count)]
+        with st.spinner(f"Running {len(sources):,} searches"):
+            matrix, stats = distance_matrix(graph, sources, targets, workers)
+        st.session_state.large_matrix = (graph, sources, targets, matrix, stats)
+
+    result = st.session_state.get("large_matrix")
+    if result is None or result[0] is not graph:
+        return
+    _, sources, targets, matrix, stats = result
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Searches", f"{stats['searches']:,}")
+    col2.metric("Searches / s", f"{stats['searches/s']:,.1f}")
+    col3.metric("Searches / s / Core", f"{stats['searches/s/core']:,.1f}")
+    st.caption(f"{len(sources)} x {len(targets)} matrix in {stats['seconds']:.2f} s on {stats['workers']} worker processes")
+    # Only a corner is shown; the downloads hold the whole matrix
+    st.dataframe({"source": sources[:50], **{str(t): matrix[:50, j] for j, t in enumerate(targets[:50])}})
+    col1, col2 = st.columns(2)
+    col1.download_button("Download Matrix as CSV", matrix_csv(matrix, sources, targets),
+                         file_name="distance_matrix.csv", mime="text/csv")
+    col2.download_button("Download Matrix as NPY", matrix_npy(matrix),
+                         file_name="distance_matrix.npy", mime="application/octet-stream")
+
+def show_large_graph(path_color):
+    st.sidebar.header("Large Graph")
+    source = st.sidebar.radio("Graph Source", ["Random Road Grid", "Random Sparse Graph", "Graph File"])
+    if source in ("Random Road Grid", "Random Sparse Graph"):
+        num_nodes = st.sidebar.number_input("Nodes", 10, 10000000, 100000, step=10000)
+        if source == "Random Road Grid":
+            if st.sidebar.button("Generate Large Graph"):
+                st.session_state.large_graph = random_grid_csr(int(num_nodes))
+        else:
+            avg_degree = st.sidebar.slider("Average Out-degree", 1, 10, 4)
+            if st.sidebar.button("Generate Large Graph"):
+                st.session_state.large_graph = random_csr(int(num_nodes), avg_degree)
+        index_dir = "landmarks.alt"
+    else:
+        path = st.sidebar.text_input("DIMACS .gr or edge-list file", "graph.gr")
+        index_dir = f"{path}.alt"
+        undirected = st.sidebar.checkbox("Edges are undirected")
+        if st.sidebar.button("Load Graph File"):
+            if os.path.exists(path):
+                st.session_state.large_graph = load_large_graph(path, os.path.getmtime(path), undirected)
             else:
-                dot.node(name, name, fillcolor=default_color)
-
-        for start, ends in self.edges.items():
-            for end, weight in ends.items():
-                if path and start in path and end in path and path.index(end) == path.index(start) + 1:
-                    dot.edge(start, end, label=str(weight), color=path_color, penwidth='3')
-                else:
-                    dot.edge(start, end, label=str(weight), color='#A9A9A9', penwidth='2')
-
-        return dot
-
-    def get_mermaid(self, path=None):
-        mermaid_code = ["graph LR"]
-        for start, ends in self.edges.items():
-            for end, weight in ends.items():
-                if path and start in path and end in path and path.index(end) == path.index(start) + 1:
-                    mermaid_code.append(f"    {start}-->{end}")
-                    mermaid_code.append(f"    style {start} fill:#ff0000")
-                    mermaid_code.append(f"    style {end} fill:#ff0000")
-                else:
-                    mermaid_code.append(f"    {start}--{weight}-->{end}")
-        return "\n".join(mermaid_code)
-
-    def dijkstra(self, start, end):
-        for node in self.nodes.values():
-            node.distance = float('inf')
-            node.previous = None
-            node.visited = False
-            node.current = False
-
-        self.nodes[start].distance = 0
-        pq = PriorityQueue()
-        pq.put((0, start))
-
-        while not pq.empty():
-            current_distance, current_node = pq.get()
-            
-            if current_node == end:
-                break
-
-            if current_distance > self.nodes[current_node].distance:
-                continue
-
-            self.nodes[current_node].visited = True
-
-            if current_node in self.edges:
-                for neighbor, weight in self.edges[current_node].items():
-                    distance = current_distance + weight
-                    if distance < self.nodes[neighbor].distance:
-                        self.nodes[neighbor].distance = distance
-                        self.nodes[neighbor].previous = current_node
-                        pq.put((distance, neighbor))
-
-        path = []
-        current = end
-        while current:
-            path.append(current)
-            current = self.nodes[current].previous
-        path.reverse()
-
-        return path if path[0] == start else []
-
-def create_random_graph(num_nodes, max_weight):
-    graph = Graph()
-    nodes = [chr(65 + i) for i in range(num_nodes)]
-    for node in nodes:
-        graph.add_node(node)
-    
-    for i in range(num_nodes - 1):
-        graph.add_edge(nodes[i], nodes[i+1], random.randint(1, max_weight))
-    
-    for _ in range(num_nodes):
-        start = random.choice(nodes)
-        end = random.choice(nodes)
-        if start != end and end not in graph.edges.get(start, {}):
-            graph.add_edge(start, end, random.randint(1, max_weight))
-    
-    return graph
+                st.sidebar.error(f"File not found: {path}")
+
+    graph = st.session_state.get("large_graph")
+    if graph is None:
+        return
+
+    st.sidebar.header("Landmark Index")
+    index_dir = st.sidebar.text_input("Landmark Index Directory", index_dir)
+    landmark_count = int(st.sidebar.number_input("Landmarks", 1, 64, 8))
+    selection = st.sidebar.selectbox("Landmark Selection", ["farthest", "random"])
+    if st.sidebar.button("Build Landmark Index"):
+        with st.spinner(f"Running {2 * landmark_count} full Dijkstra searches"):
+            start = time.perf_counter()
+            index = LandmarkIndex.build(graph, landmark_count, selection)
+            index.save(index_dir)
+        st.session_state.landmark_index = index
+        st.sidebar.success(f"Built in {time.perf_counter() - start:.1f} s and saved to {index_dir}")
+    index = get_landmark_index(graph, index_dir)
+    if index is not None:
+        st.sidebar.caption(f"Landmark index: {len(index.landmarks)} landmarks ({index_dir})")
+    else:
+        st.sidebar.caption("No landmark index for this graph")
+
+    heuristics = dict(HEURISTICS)
+    if index is not None:
+        heuristics["ALT Landmarks"] = index.heuristic
+
+    st.header("Large Graph")
+    col1, col2 = st.columns(2)
+    col1.metric("Nodes", f"{graph.num_nodes:,}")
+    col2.metric("Edges", f"{graph.num_edges:,}")
+    source_id = int(col1.number_input("Source Node ID", 0, graph.num_nodes - 1, 0))
+    target_id = int(col2.number_input("Target Node ID", 0, graph.num_nodes - 1, graph.num_nodes - 1))
+
+    col1, col2 = st.columns(2)
+    mode = col1.selectbox("Search Mode", list(MODES))
+    heuristic = col2.selectbox("A* Heuristic", list(heuristics), disabled=mode != "A*")
+    if graph.coords is None:
+        st.caption("This graph has no coordinates, so the Euclidean heuristic falls back to zero.")
+
+    if st.button("Find Shortest Path in Large Graph"):
+        st.session_state.large_result = (graph, run_query(graph, mode, source_id, target_id, heuristics[heuristic]))
+    if st.button("Compare Search Modes"):
+        rows = compare_modes(graph, source_id, target_id, heuristic=heuristics[heuristic])
+        if index is not None and heuristic != "ALT Landmarks":
+            # Same A* query with the landmark bounds instead of straight lines
+            row = run_query(graph, "A*", source_id, target_id, index.heuristic)
+            del row["path"]
+            row["mode"] = "A* (ALT landmarks)"
+            rows.append(row)
+        st.session_state.large_comparison = (graph, rows)
+
+    comparison = st.session_state.get("large_comparison")
+    if comparison is not None and comparison[0] is graph:
+        st.dataframe(comparison[1])
+
+    result = st.session_state.get("large_result")
+    if result is None or result[0] is not graph:
+        return
+    query = result[1]
+    path, distance = query["path"], query["distance"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Distance", "unreachable" if distance is None else f"{distance:,.6g}")
+    col2.metric("Settled Nodes", f"{query['settled nodes']:,}")
+    col3.metric(f"{query['mode']} Time", f"{query['ms']:.1f} ms")
+    if path:
+        # Only the path and the nodes next to it are drawn
+        placeholder = st.empty()
+        dot = get_neighborhood_graphviz(graph, path, path_color)
+        job = get_render_pool().submit(f"{session_slot()}-large", dot, format='png')
+        png_data = await_render(job, placeholder, message="Rendering path neighborhood")
+        if png_data is not None:
+            caption = f"Path of {len(path)} nodes and its neighborhood"
+            if len(path) > 150:
+                caption += " (first 150 path nodes)"
+            placeholder.image(png_data, caption=caption)
 
 def main():
     st.title("Interactive Dijkstra's Algorithm Visualization")
@@ -163,6 +217,10 @@ def main():
     if st.sidebar.button("Find Shortest Path"):
         path = graph.dijkstra(start_node, end_node)
         st.session_state.path = path
+        # Recorded once here; playback only replays the log
+        trace = graph.trace_dijkstra(start_node, end_node)
+        st.session_state.trace = (graph, graph.version, trace)
+        st.session_state.trace_step = len(trace)
         if path:
             st.sidebar.success(f"Shortest path: {' -> '.join(path)}")
         else:
@@ -170,17 +228,55 @@ def main():
     else:
         st.session_state.path = []
 
-    dot = graph.get_graphviz(bg_color, box_color, default_color, visited_color, current_color, path_color, zoom_level, st.session_state.path)
+    trees = graph.trees
+    st.sidebar.caption(f"Path tree cache: {trees.hits} hits, {trees.misses} misses "
+                       f"({trees.hit_rate:.0%} hit rate), {len(trees.trees)} trees")
+
+    trace, step, lookahead = None, None, 0
+    recorded = st.session_state.get("trace")
+    if recorded is not None and recorded[0] is graph and recorded[1] == graph.version:
+        trace = recorded[2]
+        st.sidebar.header("Search Playback")
+        if st.session_state.get("trace_playing") and st.session_state.get("trace_step", 0) < len(trace):
+            st.session_state.trace_step = st.session_state.get("trace_step", 0) + 1
+
+        def move_step(delta):
+            st.session_state.trace_step = max(0, min(len(trace), st.session_state.get("trace_step", 0) + delta))
+
+        def rewind():
+            # Play from the start when the last frame is showing
+            if st.session_state.trace_playing and st.session_state.get("trace_step", 0) >= len(trace):
+                st.session_state.trace_step = 0
+
+        col1, col2 = st.sidebar.columns(2)
+        col1.button("Previous Step", on_click=move_step, args=(-1,))
+        col2.button("Next Step", on_click=move_step, args=(1,))
+        step = st.sidebar.slider("Search Step", 0, len(trace), key="trace_step")
+        playing = st.sidebar.checkbox("Play", key="trace_playing", on_change=rewind)
+        frame_delay = st.sidebar.slider("Seconds per Step", 0.1, 2.0, 0.5, 0.1)
+        lookahead = st.sidebar.slider("Frames to Pre-render", 0, 20, 5)
+        counts = trace.counts()
+        st.sidebar.caption(f"{counts['events']} events: {counts['settles']} settles, "
+                           f"{counts['relaxations']} relaxations, {counts['pushes']} queue pushes")
+
+    colors = (bg_color, box_color, default_color, visited_color, current_color, path_color, zoom_level)
+    if trace is None:
+        dot = show_graph(graph, lambda: graph.get_graphviz(*colors, st.session_state.path, graph.positions),
+                         "Dijkstra's Algorithm Graph", "dijkstra_graph.png")
+    else:
+        names = graph.get_csr()[1]
+        trace_path = [names[i] for i in trace.path]
 
-    png_data = dot.pipe(format='png')
-    st.image(png_data, caption="Dijkstra's Algorithm Graph", use_column_width=True)
+        def frame_dot(k):
+            # The found path is drawn on the last frame only
+            return graph.get_graphviz(*colors, trace_path if k == len(trace) else None, graph.positions,
+                                      graph.trace_frame(trace, k))
 
-    st.download_button(
-        label="Download Graph as PNG",
-        data=png_data,
-        file_name="dijkstra_graph.png",
-        mime="image/png"
-    )
+        # Queued behind the visible frame, so stepping forward finds the
+        # next frames in the render cache
+        ahead = (frame_dot(k) for k in range(step + 1, min(step + lookahead, len(trace)) + 1))
+        dot = show_graph(graph, lambda: frame_dot(step), f"Step {step} of {len(trace)}: {trace.describe(step, names)}",
+                         "dijkstra_graph.png", ahead)
 
     tab1, tab2 = st.tabs(["Graphviz DOT", "Mermaid"])
 
@@ -193,5 +289,13 @@ def main():
         mermaid_code = graph.get_mermaid(st.session_state.path)
         st.code(mermaid_code, language="mermaid")
 
+    show_large_graph(path_color)
+    if st.session_state.get("large_graph") is not None:
+        show_distance_matrix(st.session_state.large_graph)
+
+    if trace is not None and playing and step < len(trace):
+        time.sleep(frame_delay)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
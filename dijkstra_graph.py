@@ -0,0 +1,170 @@
+import random
+
+from graphviz import Digraph
+
+from dijkstra_trace import traced_dijkstra
+from graph_csr import CSRGraph, path_from
+from graph_layout import pinned
+from shortest_paths import ShortestPathTreeCache
+
+
+class Node:
+    def __init__(self, name):
+        self.name = name
+        self.visited = False
+        self.current = False
+        self.distance = float('inf')
+        self.previous = None
+
+
+class Graph:
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        self.positions = None
+        self.csr = None
+        self.version = 0
+        self.trees = ShortestPathTreeCache()
+
+    def add_node(self, name):
+        self.nodes[name] = Node(name)
+        self.positions = None
+        self.csr = None
+        self.version += 1
+
+    def add_edge(self, start, end, weight):
+        self.positions = None
+        self.csr = None
+        self.version += 1
+        if start not in self.edges:
+            self.edges[start] = {}
+        self.edges[start][end] = weight
+
+    def get_graphviz(self, bg_color, box_color, default_color, visited_color, current_color, path_color, zoom_level, path=None, positions=None, frame=None):
+        dot = Digraph(comment='Dijkstra\'s Algorithm Visualization')
+        dot.engine = 'neato'
+        
+        width, height = 22 * zoom_level, 17 * zoom_level
+        size = f"{width},{height}"
+        dot.attr(rankdir='LR', bgcolor=bg_color, size=size, dpi="60")
+        
+        with dot.subgraph(name='cluster_bg') as c:
+            c.attr(style='filled,rounded', color=box_color, fillcolor=box_color, penwidth='2')
+            c.attr(label='', fontcolor="#00000000")
+
+        node_size = max(0.3, 0.8 / zoom_level)
+        dot.attr('node', shape='circle', style='filled', fontcolor='black', fontname='Arial', 
+                 fontsize=str(max(10, int(20 / zoom_level))), width=str(node_size), height=str(node_size), fixedsize='true')
+        
+        edge_len = max(1.0, 2.0 * zoom_level)
+        dot.attr('edge', fontname='Arial', fontsize=str(max(8, int(16 / zoom_level))), len=str(edge_len))
+
+        for name, node in self.nodes.items():
+            pin = {'pos': pinned(positions[name], zoom_level)} if positions else {}
+            if frame is not None:
+                # A step of a recorded search instead of the flags on the nodes
+                distance = frame["distance"].get(name)
+                label = name if distance is None else f"{name}\n{distance:g}"
+                if name == frame["current"]:
+                    dot.node(name, label, fillcolor=current_color, penwidth='3', **pin)
+                elif path and name in path:
+                    dot.node(name, label, fillcolor=path_color, **pin)
+                elif name in frame["settled"]:
+                    dot.node(name, label, fillcolor=visited_color, **pin)
+                elif name in frame["queued"]:
+                    dot.node(name, label, fillcolor=default_color, style='filled,dashed', penwidth='2', **pin)
+                else:
+                    dot.node(name, label, fillcolor=default_color, **pin)
+            elif path and name in path:
+                dot.node(name, name, fillcolor=path_color, **pin)
+            elif node.visited:
+                dot.node(name, name, fillcolor=visited_color, **pin)
+            elif node.current:
+                dot.node(name, name, fillcolor=current_color, penwidth='3', **pin)
+            else:
+                dot.node(name, name, fillcolor=default_color, **pin)
+
+        for start, ends in self.edges.items():
+            for end, weight in ends.items():
+                if path and start in path and end in path and path.index(end) == path.index(start) + 1:
+                    dot.edge(start, end, label=str(weight), color=path_color, penwidth='3')
+                elif frame is not None and frame["edge"] == (start, end):
+                    dot.edge(start, end, label=str(weight), color=current_color, penwidth='4')
+                else:
+                    dot.edge(start, end, label=str(weight), color='#A9A9A9', penwidth='2')
+
+        return dot
+
+    def get_mermaid(self, path=None):
+        mermaid_code = ["graph LR"]
+        for start, ends in self.edges.items():
+            for end, weight in ends.items():
+                if path and start in path and end in path and path.index(end) == path.index(start) + 1:
+                    mermaid_code.append(f"    {start}-->{end}")
+                    mermaid_code.append(f"    style {start} fill:#ff0000")
+                    mermaid_code.append(f"    style {end} fill:#ff0000")
+                else:
+                    mermaid_code.append(f"    {start}--{weight}-->{end}")
+        return "\n".join(mermaid_code)
+
+    def get_csr(self):
+        # CSR copy of the edges for the search, with node names mapped to ids
+        if self.csr is None:
+            names = list(self.nodes)
+            index = {name: i for i, name in enumerate(names)}
+            edges = [(index[u], index[v], w) for u, ends in self.edges.items() for v, w in ends.items()]
+            sources, targets, weights = zip(*edges) if edges else ((), (), ())
+            self.csr = (CSRGraph.from_edges(sources, targets, weights, len(names)), names, index)
+        return self.csr
+
+    def dijkstra(self, start, end):
+        # The full tree from start is cached, so another end node is only a
+        # walk back through the predecessors
+        csr, names, index = self.get_csr()
+        dist, parent = self.trees.tree(self.version, index[start], lambda source: csr.dijkstra(source)[:2])
+        end_distance = dist.get(index[end], float('inf'))
+
+        for i, name in enumerate(names):
+            node = self.nodes[name]
+            node.distance = dist.get(i, float('inf'))
+            node.previous = names[parent[i]] if parent.get(i, -1) != -1 else None
+            # Exactly the nodes an early-stopping search settles before end
+            node.visited = node.distance < end_distance
+            node.current = False
+
+        return [names[i] for i in path_from(parent, index[end])]
+
+    def trace_dijkstra(self, start, end):
+        # One search from start to end with every step logged for playback
+        csr, names, index = self.get_csr()
+        return traced_dijkstra(csr, index[start], index[end])
+
+    def trace_frame(self, trace, step):
+        # trace.frame(step) with node ids turned back into names
+        names = self.get_csr()[1]
+        frame = trace.frame(step)
+        return {
+            "settled": {names[i] for i in frame["settled"]},
+            "queued": {names[i] for i in frame["queued"]},
+            "distance": {names[i]: d for i, d in frame["distance"].items()},
+            "current": None if frame["current"] is None else names[frame["current"]],
+            "edge": None if frame["edge"] is None else (names[frame["edge"][0]], names[frame["edge"][1]]),
+        }
+
+
+def create_random_graph(num_nodes, max_weight):
+    graph = Graph()
+    nodes = [chr(65 + i) for i in range(num_nodes)]
+    for node in nodes:
+        graph.add_node(node)
+    
+    for i in range(num_nodes - 1):
+        graph.add_edge(nodes[i], nodes[i+1], random.randint(1, max_weight))
+    
+    for _ in range(num_nodes):
+        start = random.choice(nodes)
+        end = random.choice(nodes)
+        if start != end and end not in graph.edges.get(start, {}):
+            graph.add_edge(start, end, random.randint(1, max_weight))
+    
+    return graph
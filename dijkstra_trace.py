@@ -0,0 +1,143 @@
+from array import array
+from heapq import heappop, heappush
+
+PUSH = 0    # `node` enters the queue with tentative distance `distance` via `other`
+SETTLE = 1  # `node` leaves the queue with its final distance
+RELAX = 2   # edge other -> node is examined; `distance` is the candidate
+
+
+class DijkstraTrace:
+    # Compact event log of one Dijkstra run: four parallel arrays instead of a
+    # copy of the search state per step. Every `checkpoint_every` events the
+    # (settled, tentative distance) state is kept, so any frame is rebuilt by
+    # replaying at most that many events.
+    def __init__(self, num_nodes, source, target, checkpoint_every=None):
+        self.num_nodes = num_nodes
+        self.source = source
+        self.target = target
+        self.kinds = array('b')
+        self.nodes = array('i')
+        self.others = array('i')
+        self.distances = array('d')
+        self.path = []
+        self.checkpoint_every = checkpoint_every or max(64, num_nodes)
+        self._checkpoints = [(set(), {})]
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _append(self, kind, node, other, distance):
+        self.kinds.append(kind)
+        self.nodes.append(node)
+        self.others.append(other)
+        self.distances.append(distance)
+        if len(self.kinds) % self.checkpoint_every == 0:
+            settled, dist = self._checkpoints[-1]
+            settled, dist = set(settled), dict(dist)
+            self._replay(settled, dist, len(self.kinds) - self.checkpoint_every, len(self.kinds))
+            self._checkpoints.append((settled, dist))
+
+    def record_push(self, node, distance, via=-1):
+        self._append(PUSH, node, via, distance)
+
+    def record_settle(self, node, distance):
+        self._append(SETTLE, node, -1, distance)
+
+    def record_relax(self, u, v, candidate):
+        self._append(RELAX, v, u, candidate)
+
+    def _replay(self, settled, dist, start, stop):
+        kinds, nodes, distances = self.kinds, self.nodes, self.distances
+        for e in range(start, stop):
+            if kinds[e] == SETTLE:
+                settled.add(nodes[e])
+            elif kinds[e] == PUSH:
+                dist[nodes[e]] = distances[e]
+
+    def frame(self, step):
+        # Search state after the first `step` events: settled nodes, tentative
+        # distances, the node being expanded, the edge just examined (if the
+        # last event was a relax) and the last event itself
+        step = max(0, min(step, len(self)))
+        c = min(step // self.checkpoint_every, len(self._checkpoints) - 1)
+        settled, dist = self._checkpoints[c]
+        settled, dist = set(settled), dict(dist)
+        self._replay(settled, dist, c * self.checkpoint_every, step)
+        current, edge, event = None, None, None
+        if step:
+            e = step - 1
+            event = (self.kinds[e], self.nodes[e], self.others[e], self.distances[e])
+            kind = self.kinds[e]
+            # Relaxations and pushes both name the node being expanded
+            current = self.nodes[e] if kind == SETTLE else self.others[e] if self.others[e] != -1 else None
+            if kind == RELAX:
+                edge = (self.others[e], self.nodes[e])
+        return {
+            "settled": settled,
+            "distance": dist,
+            "queued": set(dist) - settled,
+            "current": current,
+            "edge": edge,
+            "event": event,
+        }
+
+    def describe(self, step, names):
+        # One-line caption for the event that produced frame `step`
+        if step <= 0 or step > len(self):
+            return f"Start at {names[self.source]}" if step <= 0 else "Done"
+        e = step - 1
+        kind, node, other, distance = self.kinds[e], self.nodes[e], self.others[e], self.distances[e]
+        if kind == SETTLE:
+            return f"Settle {names[node]} at distance {distance:g}"
+        if kind == RELAX:
+            return f"Relax {names[other]} -> {names[node]}: candidate {distance:g}"
+        if other == -1:
+            return f"Push {names[node]} with distance {distance:g}"
+        return f"Push {names[node]} with distance {distance:g} via {names[other]}"
+
+    def counts(self):
+        return {
+            "events": len(self),
+            "settles": self.kinds.count(SETTLE),
+            "relaxations": self.kinds.count(RELAX),
+            "pushes": self.kinds.count(PUSH),
+        }
+
+
+def traced_dijkstra(graph, source, target=None):
+    # CSRGraph.dijkstra with every push, settle and relaxation logged.
+    # Returns the trace; its path is [] when target is unreachable.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    trace = DijkstraTrace(graph.num_nodes, source, target)
+    inf = float('inf')
+    dist = {source: 0}
+    parent = {source: -1}
+    settled = set()
+    heap = [(0, source)]
+    trace.record_push(source, 0)
+    while heap:
+        d, u = heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        trace.record_settle(u, d)
+        if u == target:
+            break
+        lo, hi = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            if v in settled:
+                continue
+            nd = d + w
+            trace.record_relax(u, v, nd)
+            if nd < dist.get(v, inf):
+                dist[v] = nd
+                parent[v] = u
+                heappush(heap, (nd, v))
+                trace.record_push(v, nd, u)
+    if target in settled:
+        node = target
+        while node != -1:
+            trace.path.append(node)
+            node = parent[node]
+        trace.path.reverse()
+    return trace
@@ -0,0 +1,127 @@
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from graph_csr import CSRGraph
+
+_worker_state = {}
+
+
+def _share(array):
+    # Copies an array into a new shared memory block; returns the block and
+    # the (name, shape, dtype) a worker needs to map it
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(graph_specs, targets_spec, matrix_spec):
+    # Workers map the graph and the result matrix instead of receiving
+    # copies; the blocks are kept referenced so the views stay valid
+    blocks, arrays = zip(*(_attach(spec) for spec in (*graph_specs, targets_spec, matrix_spec)))
+    offsets, targets, weights, wanted, matrix = arrays
+    _worker_state['blocks'] = blocks
+    _worker_state['graph'] = CSRGraph(offsets, targets, weights)
+    _worker_state['wanted'] = wanted.tolist()
+    _worker_state['matrix'] = matrix
+
+
+def distances_to(graph, source, wanted):
+    # Single-source Dijkstra that stops once every wanted node is settled.
+    # Returns the distances to wanted in order, inf where unreachable.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    inf = float('inf')
+    remaining = set(wanted)
+    dist = {source: 0}
+    settled = set()
+    heap = [(0, source)]
+    while heap and remaining:
+        d, u = heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        remaining.discard(u)
+        lo, hi = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            nd = d + w
+            if nd < dist.get(v, inf):
+                dist[v] = nd
+                heappush(heap, (nd, v))
+    return [dist[v] if v in settled else inf for v in wanted]
+
+
+def _fill_rows(rows, sources):
+    # Writes the matrix rows for a chunk of sources straight into shared memory
+    graph, wanted, matrix = _worker_state['graph'], _worker_state['wanted'], _worker_state['matrix']
+    for row, source in zip(rows, sources):
+        matrix[row] = distances_to(graph, source, wanted)
+    return len(sources)
+
+
+def distance_matrix(graph, sources, targets, workers=None, chunk_size=16):
+    # Shortest-path distances from every source (rows) to every target
+    # (columns), one search per source spread over a process pool. The graph
+    # and the matrix live in shared memory, so tasks only carry source ids.
+    # Returns (matrix, stats).
+    sources = [int(s) for s in sources]
+    targets = np.asarray(targets, dtype=np.int64)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sources) or 1))
+    began = time.perf_counter()
+    blocks = []
+    try:
+        graph_specs = []
+        for array in (graph.offsets, graph.targets, graph.weights):
+            block, spec = _share(array)
+            blocks.append(block)
+            graph_specs.append(spec)
+        block, targets_spec = _share(targets)
+        blocks.append(block)
+        matrix_block, matrix_spec = _share(np.full((len(sources), len(targets)), np.inf))
+        blocks.append(matrix_block)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(graph_specs, targets_spec, matrix_spec)) as pool:
+            chunks = [(range(i, min(i + chunk_size, len(sources))), sources[i:i + chunk_size])
+                      for i in range(0, len(sources), chunk_size)]
+            searches = sum(pool.map(_fill_rows, *zip(*chunks))) if chunks else 0
+        matrix = np.ndarray((len(sources), len(targets)), np.float64, buffer=matrix_block.buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    elapsed = time.perf_counter() - began
+    rate = searches / elapsed if elapsed > 0 else 0.0
+    return matrix, {
+        "searches": searches,
+        "seconds": elapsed,
+        "workers": workers,
+        "searches/s": rate,
+        "searches/s/core": rate / workers,
+    }
+
+
+def matrix_csv(matrix, sources, targets):
+    # Header row of target ids, then one row per source led by its id;
+    # unreachable pairs are written as inf
+    out = io.StringIO()
+    out.write(",".join(["source"] + [str(t) for t in targets]) + "\n")
+    for source, row in zip(sources, matrix.tolist()):
+        out.write(",".join([str(source)] + [f"{d:.10g}" for d in row]) + "\n")
+    return out.getvalue()
+
+
+def matrix_npy(matrix):
+    out = io.BytesIO()
+    np.save(out, matrix)
+    return out.getvalue()
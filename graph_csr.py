@@ -0,0 +1,258 @@
+import hashlib
+import os
+from heapq import heappop, heappush
+
+import numpy as np
+
+CHUNK_LINES = 1 << 20
+
+
+class CSRGraph:
+    # Directed graph in compressed sparse row form: the out-edges of node u
+    # are targets[offsets[u]:offsets[u + 1]] with matching weights. Nodes are
+    # integer ids 0..n-1, optionally with (x, y) coordinates. The arrays may
+    # be memory-mapped .npy files.
+    def __init__(self, offsets, targets, weights, coords=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.coords = coords
+        self._reverse = None
+        self._fingerprint = None
+
+    @property
+    def num_nodes(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def neighbors(self, u):
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return self.targets[lo:hi], self.weights[lo:hi]
+
+    def fingerprint(self):
+        # Content hash of the edges, computed once; ties saved indexes to the
+        # exact graph they were built for
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for array in (self.offsets, self.targets, self.weights):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def sources(self):
+        # Source node of every edge, in edge order
+        return np.repeat(np.arange(self.num_nodes), np.diff(self.offsets))
+
+    def reverse(self):
+        # Same graph with every edge flipped, built on first use
+        if self._reverse is None:
+            self._reverse = CSRGraph.from_edges(self.targets, self.sources(), self.weights, self.num_nodes,
+                                                coords=self.coords)
+        return self._reverse
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights, num_nodes=None, undirected=False, coords=None):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights)
+        if undirected:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            weights = np.concatenate([weights, weights])
+        if num_nodes is None:
+            num_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        order = np.argsort(sources, kind='stable')
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+        return cls(offsets, targets[order], weights[order], coords)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in ('offsets', 'targets', 'weights', 'coords'):
+            if getattr(self, name) is not None:
+                np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode)
+                  for name in ('offsets', 'targets', 'weights')]
+        coords_path = os.path.join(directory, 'coords.npy')
+        coords = np.load(coords_path, mmap_mode=mode) if os.path.exists(coords_path) else None
+        return cls(*arrays, coords)
+
+    def dijkstra(self, source, target=None):
+        # Returns (dist, parent, settled): dicts and a set holding only the
+        # nodes the search reached, so a point-to-point query on a huge graph
+        # costs nothing for the parts it never touches. Stops once target is
+        # settled.
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        inf = float('inf')
+        dist = {source: 0}
+        parent = {source: -1}
+        settled = set()
+        heap = [(0, source)]
+        while heap:
+            d, u = heappop(heap)
+            if u in settled:
+                continue
+            settled.add(u)
+            if u == target:
+                break
+            lo, hi = offsets[u], offsets[u + 1]
+            for v, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+                nd = d + w
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    parent[v] = u
+                    heappush(heap, (nd, v))
+        return dist, parent, settled
+
+    def neighborhood(self, nodes, limit=150):
+        # The given nodes plus their out-neighbours, at most `limit` in all,
+        # and every edge between them as (u, v, weight)
+        keep = list(dict.fromkeys(int(u) for u in nodes))
+        chosen = set(keep)
+        for u in list(keep):
+            for v in self.neighbors(u)[0].tolist():
+                if len(chosen) >= limit:
+                    break
+                if v not in chosen:
+                    chosen.add(v)
+                    keep.append(v)
+        edges = []
+        for u in keep:
+            for v, w in zip(*(part.tolist() for part in self.neighbors(u))):
+                if v in chosen:
+                    edges.append((u, v, w))
+        return keep, edges
+
+
+def path_from(parent, target):
+    if target not in parent:
+        return []
+    path = []
+    while target != -1:
+        path.append(target)
+        target = parent[target]
+    path.reverse()
+    return path
+
+
+def _parse_chunk(chunk, columns):
+    return np.array(b' '.join(chunk).split(), dtype=np.float64).reshape(-1, columns)
+
+
+def read_dimacs(lines):
+    # DIMACS shortest-path format: "p sp <nodes> <arcs>" then one
+    # "a <from> <to> <weight>" line per arc, node ids starting at 1
+    num_nodes = None
+    parts = []
+    chunk = []
+    for line in lines:
+        if line.startswith(b'a'):
+            chunk.append(line[1:])
+            if len(chunk) == CHUNK_LINES:
+                parts.append(_parse_chunk(chunk, 3))
+                chunk = []
+        elif line.startswith(b'p'):
+            num_nodes = int(line.split()[2])
+    if chunk:
+        parts.append(_parse_chunk(chunk, 3))
+    arcs = np.concatenate(parts) if parts else np.empty((0, 3))
+    weights = arcs[:, 2]
+    if np.all(weights == np.floor(weights)):
+        weights = weights.astype(np.int64)
+    return arcs[:, 0].astype(np.int64) - 1, arcs[:, 1].astype(np.int64) - 1, weights, num_nodes
+
+
+def read_dimacs_coordinates(lines, num_nodes=None):
+    # DIMACS coordinate file: "v <id> <x> <y>" lines, ids starting at 1
+    chunk = [line[1:] for line in lines if line.startswith(b'v')]
+    rows = _parse_chunk(chunk, 3) if chunk else np.empty((0, 3))
+    coords = np.zeros((num_nodes or len(rows), 2))
+    coords[rows[:, 0].astype(np.int64) - 1] = rows[:, 1:]
+    return coords
+
+
+def read_edge_list(lines):
+    # "<from> <to> [weight]" per line with 0-based ids; blank lines and lines
+    # starting with # or % are skipped, a missing weight counts as 1
+    parts = []
+    chunk = []
+    columns = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[:1] in (b'#', b'%'):
+            continue
+        if columns is None:
+            columns = len(line.split())
+        chunk.append(line)
+        if len(chunk) == CHUNK_LINES:
+            parts.append(_parse_chunk(chunk, columns))
+            chunk = []
+    if chunk:
+        parts.append(_parse_chunk(chunk, columns))
+    edges = np.concatenate(parts) if parts else np.empty((0, 3))
+    weights = edges[:, 2] if edges.shape[1] > 2 else np.ones(len(edges), dtype=np.int64)
+    if np.all(weights == np.floor(weights)):
+        weights = weights.astype(np.int64)
+    return edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64), weights, None
+
+
+def load_graph_file(path, undirected=False, cache=True):
+    # Parses a .gr (DIMACS) or edge-list file into CSR form. With cache, the
+    # arrays are saved next to the file and later loads memory-map them
+    # instead of parsing again, until the source file changes.
+    cache_dir = f'{path}.csr' + ('-undirected' if undirected else '')
+    marker = os.path.join(cache_dir, 'weights.npy')
+    if cache and os.path.exists(marker) and os.path.getmtime(marker) >= os.path.getmtime(path):
+        return CSRGraph.load(cache_dir)
+    reader = read_dimacs if path.endswith('.gr') else read_edge_list
+    with open(path, 'rb') as f:
+        sources, targets, weights, num_nodes = reader(f)
+    # A DIMACS graph may come with a .co file of node coordinates beside it
+    coords = None
+    coords_path = path[:-3] + '.co'
+    if path.endswith('.gr') and os.path.exists(coords_path):
+        with open(coords_path, 'rb') as f:
+            coords = read_dimacs_coordinates(f, num_nodes)
+    graph = CSRGraph.from_edges(sources, targets, weights, num_nodes, undirected, coords)
+    if cache:
+        graph.save(cache_dir)
+        return CSRGraph.load(cache_dir)
+    return graph
+
+
+def random_csr(num_nodes, avg_degree=4, max_weight=100, seed=None):
+    # Random sparse graph with a ring through all nodes, so every node can
+    # reach every other, plus random extra arcs
+    rng = np.random.default_rng(seed)
+    ring = np.arange(num_nodes)
+    extra = num_nodes * max(avg_degree - 1, 0)
+    sources = np.concatenate([ring, rng.integers(0, num_nodes, extra)])
+    targets = np.concatenate([(ring + 1) % num_nodes, rng.integers(0, num_nodes, extra)])
+    weights = rng.integers(1, max_weight + 1, len(sources))
+    return CSRGraph.from_edges(sources, targets, weights, num_nodes)
+
+
+def random_grid_csr(num_nodes, seed=None):
+    # Road-like test graph: nodes on a jittered square grid, two-way streets
+    # to the grid neighbours and a few diagonals, each edge a bit longer than
+    # the straight line so Euclidean distance is a valid A* bound
+    rng = np.random.default_rng(seed)
+    side = max(2, int(np.ceil(np.sqrt(num_nodes))))
+    ids = np.arange(num_nodes)
+    coords = np.column_stack([ids % side, ids // side]).astype(np.float64)
+    coords += rng.uniform(-0.3, 0.3, coords.shape)
+    right = ids[(ids % side < side - 1) & (ids + 1 < num_nodes)]
+    down = ids[ids + side < num_nodes]
+    diagonal = ids[(ids % side < side - 1) & (ids + side + 1 < num_nodes)]
+    diagonal = diagonal[rng.random(len(diagonal)) < 0.2]
+    sources = np.concatenate([right, down, diagonal])
+    targets = np.concatenate([right + 1, down + side, diagonal + side + 1])
+    straight = np.hypot(*(coords[sources] - coords[targets]).T)
+    weights = np.ceil(straight * rng.uniform(1.0, 1.5, len(sources)) * 1000) / 1000
+    return CSRGraph.from_edges(sources, targets, weights, num_nodes, undirected=True, coords=coords)
@@ -0,0 +1,37 @@
+import shlex
+
+from graphviz import Digraph
+
+POINTS_PER_INCH = 72
+
+
+def layout_dot(nodes, edges, node_size=0.8, edge_len=2.0):
+    # Graph for the one neato layout run at zoom level 1. Colours and labels
+    # do not move nodes, so only the structure and the sizes that matter
+    # are included.
+    dot = Digraph(engine='neato')
+    dot.attr('node', shape='circle', width=str(node_size), height=str(node_size), fixedsize='true')
+    dot.attr('edge', len=str(edge_len))
+    for name in nodes:
+        dot.node(name)
+    for start, ends in edges.items():
+        for end in ends:
+            dot.edge(start, end)
+    return dot
+
+
+def parse_plain(plain):
+    # {node name: (x, y)} in points from graphviz "plain" output
+    positions = {}
+    for line in plain.splitlines():
+        fields = shlex.split(line)
+        if fields and fields[0] == 'node':
+            positions[fields[1]] = (float(fields[2]) * POINTS_PER_INCH, float(fields[3]) * POINTS_PER_INCH)
+    return positions
+
+
+def pinned(position, zoom_level=1.0):
+    # pos attribute for neato -n; edge lengths grow with zoom, so the stored
+    # layout is stretched by the same factor
+    x, y = position
+    return f'{x * zoom_level:.1f},{y * zoom_level:.1f}!'
@@ -1,111 +1,172 @@
 import streamlit as st
 import random
 import string
-from graphviz import Digraph
-
-class Node:
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.next = None
-
-class HashTable:
-    def __init__(self, size):
-        self.size = size
-        self.table = [None] * size
-
-    def hash_function(self, key):
-        return sum(ord(char) for char in key) % self.size
-
-    def insert(self, key, value):
-        index = self.hash_function(key)
-        if self.table[index] is None:
-            self.table[index] = Node(key, value)
-        else:
-            current = self.table[index]
-            while current.next:
-                if current.key == key:
-                    current.value = value
-                    return
-                current = current.next
-            if current.key == key:
-                current.value = value
-            else:
-                current.next = Node(key, value)
-
-    def get(self, key):
-        index = self.hash_function(key)
-        current = self.table[index]
-        while current:
-            if current.key == key:
-                return current.value
-            current = current.next
-        return None
-
-    def delete(self, key):
-        index = self.hash_function(key)
-        if self.table[index] is None:
-            return
-
-        if self.table[index].key == key:
-            self.table[index] = self.table[index].next
-            return
-
-        current = self.table[index]
-        while current.next:
-            if current.next.key == key:
-                current.next = current.next.next
-                return
-            current = current.next
-
-def visualize_hash_table(hash_table, highlight_index=None, highlight_key=None):
-    dot = Digraph(comment='Hash Table with Linked Lists')
-    dot.attr(rankdir='LR')
-    
-    # Create a node for the hash table
-    dot.node('hash_table', 'Hash Table', shape='record', label='{{0|1|2|3|4|5|6|7|8|9}}')
-    
-    # Create nodes for each bucket and its linked list
-    for i in range(hash_table.size):
-        bucket_name = f'bucket_{i}'
-        if hash_table.table[i] is None:
-            dot.node(bucket_name, 'None')
-        else:
-            current = hash_table.table[i]
-            prev_node = None
-            while current:
-                node_name = f'{bucket_name}_{current.key}'
-                node_color = 'lightblue' if i == highlight_index and current.key == highlight_key else 'white'
-                dot.node(node_name, f'{current.key}: {current.value}', style='filled', fillcolor=node_color)
-                if prev_node:
-                    dot.edge(prev_node, node_name)
-                else:
-                    dot.edge(bucket_name, node_name)
-                prev_node = node_name
-                current = current.next
-        
-        # Connect hash table to bucket
-        dot.edge(f'hash_table:{i}', bucket_name)
-    
-    return dot
+import io
+import time
+from hash_backends import BACKENDS
+from concurrent_hash import StripedHashTable
+from hash_bench import run_benchmark, run_concurrent_benchmark
+from hash_functions import HASH_FUNCTIONS, chain_lengths_for, chain_summary
+from hash_loaders import read_records
+from hash_render import HashTableRenderer, occupancy_heatmap
+from hash_table import HashTable
+
+def show_hash_table(hash_table, highlight_key=None):
+    renderer = st.session_state.setdefault('renderer', HashTableRenderer())
+    if not renderer.summarize(hash_table):
+        st.graphviz_chart(renderer.render(hash_table, highlight_key))
+        return
+
+    # Too many entries for one graph: bucket occupancy heatmap plus a single chain
+    # chain_lengths() lists both tables back to back while rehashing
+    tables = {"Hash Table": (hash_table.table, hash_table.size, 0)}
+    if hash_table.rehashing:
+        tables["New Hash Table"] = (hash_table.new_table, hash_table.new_size, hash_table.size)
+    name = st.selectbox("Table", list(tables), key="inspect_table") if len(tables) > 1 else "Hash Table"
+    table, size, offset = tables[name]
+    lengths = hash_table.chain_lengths()[offset:offset + size]
+    image, per_cell = occupancy_heatmap(lengths)
+    caption = f"Bucket occupancy ({size} buckets" + (f", {per_cell} per cell)" if per_cell > 1 else ")")
+    st.image(image, caption=caption)
+
+    default_bucket = hash_table.hash_fn(highlight_key) % size if highlight_key is not None else 0
+    bucket = st.number_input("Inspect bucket", min_value=0, max_value=size - 1, value=default_bucket,
+                             key="inspect_bucket")
+    st.graphviz_chart(renderer.render_chain(table, bucket, highlight_key))
 
 def generate_random_key_value():
     key = ''.join(random.choices(string.ascii_lowercase, k=3))
     value = random.randint(1, 100)
     return key, value
 
+@st.cache_resource
+def get_shared_table():
+    # One instance per server process, shared by every session
+    return StripedHashTable()
+
+def show_shared_table():
+    shared = get_shared_table()
+    with st.expander("Shared Table (all sessions)"):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Entries", shared.count)
+        col2.metric("Buckets", shared.size)
+        col3.metric("Contended Locks", f"{shared.contention:.2%}")
+
+        key = st.text_input("Shared key")
+        value = st.number_input("Shared value", value=0)
+        col1, col2, col3 = st.columns(3)
+        if col1.button("Insert Shared") and key:
+            shared.insert(key, value)
+            st.success(f"Inserted key '{key}' into the shared table")
+        if col2.button("Get Shared") and key:
+            found = shared.get(key)
+            if found is not None:
+                st.success(f"Value for key '{key}': {found}")
+            else:
+                st.error(f"Key '{key}' not found")
+        if col3.button("Delete Shared") and key:
+            shared.delete(key)
+            st.success(f"Deleted key '{key}' from the shared table")
+
+        threads = st.multiselect("Benchmark threads", [1, 2, 4, 8, 16, 32], default=[1, 4, 16])
+        if st.button("Run Concurrent Benchmark"):
+            with st.spinner("Running concurrent load..."):
+                st.dataframe(run_concurrent_benchmark(thread_counts=threads))
+
+def show_statistics(hash_table):
+    st.subheader("Statistics")
+    stats = hash_table.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Entries", stats["entries"])
+    col2.metric("Load Factor", f"{stats['load factor']:.2f}")
+    col3.metric("Max Chain", stats["max chain"])
+    col4.metric("Avg Probes / Op", f"{stats['avg probes / op']:.2f}")
+
+    lengths = hash_table.chain_lengths()
+    histogram = [0] * (max(lengths, default=0) + 1)
+    for length in lengths:
+        histogram[length] += 1
+    st.write("Chain length histogram (buckets per chain length)")
+    st.bar_chart({"buckets": histogram})
+
+    # The same keys under every hash function; re-hashes every key five
+    # times, so it only runs on request
+    if st.button("Compare Hash Functions"):
+        keys = [key for key, _ in hash_table.items()]
+        comparison = []
+        for name, fn in HASH_FUNCTIONS.items():
+            summary = chain_summary(chain_lengths_for(keys, hash_table.size, fn))
+            comparison.append({"hash function": name, **summary})
+        st.write("Hash function comparison on the current keys")
+        st.dataframe(comparison)
+
 def main():
     st.title("Hash Table with Linked Lists Simulation")
 
     # Sidebar for hash table size
     table_size = st.sidebar.slider("Hash Table Size", min_value=5, max_value=15, value=10)
+    hash_name = st.sidebar.selectbox("Hash Function", list(HASH_FUNCTIONS))
+    hash_fn = HASH_FUNCTIONS[hash_name]
+
+    st.sidebar.header("Resizing")
+    auto_resize = st.sidebar.checkbox("Resize automatically", value=True)
+    max_load_factor = st.sidebar.slider("Grow above load factor", 0.5, 4.0, 1.0, 0.25)
+    rehash_step = st.sidebar.slider("Buckets migrated per operation", 1, 10, 1)
 
     # Initialize or update hash table
-    if 'hash_table' not in st.session_state or st.session_state.hash_table.size != table_size:
-        st.session_state.hash_table = HashTable(table_size)
+    if 'hash_table' not in st.session_state:
+        st.session_state.hash_table = HashTable(table_size, hash_fn)
+        st.session_state.table_size = table_size
+    elif st.session_state.table_size != table_size:
+        # Migrate to the new size incrementally instead of starting over
+        st.session_state.hash_table.resize(table_size)
+        st.session_state.table_size = table_size
+    if st.session_state.hash_table.hash_fn is not hash_fn:
+        # Rehash the existing entries so hash functions can be compared on the same keys
+        old = st.session_state.hash_table
+        rehashed = HashTable(old.new_size if old.rehashing else old.size, hash_fn)
+        for key, value in old.items():
+            rehashed.insert(key, value)
+        st.session_state.hash_table = rehashed
+
+    hash_table = st.session_state.hash_table
+    hash_table.auto_resize = auto_resize
+    hash_table.max_load_factor = max_load_factor
+    hash_table.rehash_step = rehash_step
+    if hash_table.rehashing:
+        st.sidebar.info(f"Rehashing {hash_table.size} -> {hash_table.new_size} buckets: "
+                        f"{hash_table.rehash_index}/{hash_table.size} migrated")
+        if st.sidebar.button("Finish Rehash"):
+            hash_table.rehash(hash_table.size)
+
+    st.sidebar.header("Display")
+    summary_threshold = st.sidebar.number_input("Summarize above entries", min_value=10, max_value=100000, value=200)
+    st.session_state.setdefault('renderer', HashTableRenderer()).summary_threshold = summary_threshold
+
+    st.sidebar.header("Bulk Load")
+    num_random = st.sidebar.number_input("Random keys to insert", min_value=1, max_value=1000000, value=50)
+    if st.sidebar.button("Insert Random Keys"):
+        st.session_state.hash_table.insert_many(generate_random_key_value() for _ in range(num_random))
+    uploaded = st.sidebar.file_uploader("Key/value file", type=["csv", "jsonl", "ndjson"])
+    if uploaded is not None and st.sidebar.button("Load File"):
+        lines = io.TextIOWrapper(uploaded, encoding="utf-8")
+        before = st.session_state.hash_table.count
+        start = time.perf_counter()
+        st.session_state.hash_table.insert_many(read_records(lines, uploaded.name))
+        elapsed = time.perf_counter() - start
+        loaded = st.session_state.hash_table.count - before
+        st.sidebar.success(f"Loaded {loaded} new keys in {elapsed:.2f}s "
+                           f"({loaded / elapsed if elapsed else 0:,.0f} keys/sec)")
+
+    st.sidebar.header("Backend Benchmark")
+    bench_sizes = st.sidebar.multiselect("Number of keys", [1000, 10000, 100000, 1000000, 10000000], default=[1000, 100000])
+    if st.sidebar.button("Run Benchmark"):
+        with st.spinner("Benchmarking hash table backends..."):
+            backends = {"Node chains (HashTable)": HashTable, **BACKENDS}
+            st.session_state.bench_results = run_benchmark(backends, bench_sizes, hash_fn)
 
     # Operations
-    operation = st.radio("Select Operation", ["Insert", "Get", "Delete"])
+    operation = st.radio("Select Operation", ["Insert", "Get", "Delete", "Get Many", "Delete Many"])
 
     if operation == "Insert":
         key, value = generate_random_key_value()
@@ -114,9 +175,7 @@ def main():
         if st.button("Insert"):
             st.session_state.hash_table.insert(key, value)
             st.success(f"Inserted key '{key}' with value '{value}'")
-            highlight_index = st.session_state.hash_table.hash_function(key)
-            dot = visualize_hash_table(st.session_state.hash_table, highlight_index, key)
-            st.graphviz_chart(dot)
+            st.session_state.table_view = (operation, key)
 
     elif operation == "Get":
         key = st.text_input("Enter key to retrieve")
@@ -124,27 +183,43 @@ def main():
             value = st.session_state.hash_table.get(key)
             if value is not None:
                 st.success(f"Value for key '{key}': {value}")
-                highlight_index = st.session_state.hash_table.hash_function(key)
-                dot = visualize_hash_table(st.session_state.hash_table, highlight_index, key)
-                st.graphviz_chart(dot)
+                st.session_state.table_view = (operation, key)
             else:
                 st.error(f"Key '{key}' not found")
-                dot = visualize_hash_table(st.session_state.hash_table)
-                st.graphviz_chart(dot)
+                st.session_state.table_view = (operation, None)
 
     elif operation == "Delete":
         key = st.text_input("Enter key to delete")
         if st.button("Delete"):
-            highlight_index = st.session_state.hash_table.hash_function(key)
             st.session_state.hash_table.delete(key)
             st.success(f"Deleted key '{key}'")
-            dot = visualize_hash_table(st.session_state.hash_table, highlight_index)
-            st.graphviz_chart(dot)
-
-    # Visualize current state
-    if st.button("Visualize Current State"):
-        dot = visualize_hash_table(st.session_state.hash_table)
-        st.graphviz_chart(dot)
+            st.session_state.table_view = (operation, None)
+
+    elif operation == "Get Many":
+        keys = st.text_area("Keys to retrieve (one per line)").split()
+        if st.button("Get Many"):
+            values = st.session_state.hash_table.get_many(keys)
+            st.dataframe({"key": keys, "value": [str(value) for value in values]})
+
+    elif operation == "Delete Many":
+        keys = st.text_area("Keys to delete (one per line)").split()
+        if st.button("Delete Many"):
+            deleted = st.session_state.hash_table.delete_many(keys)
+            st.success(f"Deleted {deleted} of {len(keys)} keys")
+
+    # Visualize current state, drawn once per run. The table stays up after
+    # an operation until another one is selected, so the bucket drill-down
+    # keeps working when its widgets rerun the page.
+    view_operation, highlight_key = st.session_state.get("table_view", (None, None))
+    if st.checkbox("Visualize Current State") or view_operation == operation:
+        show_hash_table(st.session_state.hash_table, highlight_key if view_operation == operation else None)
+
+    show_statistics(st.session_state.hash_table)
+    show_shared_table()
+
+    if st.session_state.get("bench_results"):
+        st.subheader("Backend Benchmark")
+        st.dataframe(st.session_state.bench_results)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,330 @@
+from array import array
+
+from hash_functions import siphash_hash
+
+_EMPTY = object()
+_TOMBSTONE = object()
+
+
+class SlotsNode:
+    __slots__ = ('key', 'value', 'next')
+
+    def __init__(self, key, value, next=None):
+        self.key = key
+        self.value = value
+        self.next = next
+
+
+class SlotsChainedHashTable:
+    # Same separate chaining as HashTable, but nodes carry no per-instance __dict__
+    def __init__(self, size=8, hash_fn=siphash_hash, max_load_factor=1.0):
+        self.size = size
+        self.table = [None] * size
+        self.hash_fn = hash_fn
+        self.max_load_factor = max_load_factor
+        self.count = 0
+
+    def insert(self, key, value):
+        index = self.hash_fn(key) % self.size
+        current = self.table[index]
+        while current:
+            if current.key == key:
+                current.value = value
+                return
+            current = current.next
+        self.table[index] = SlotsNode(key, value, self.table[index])
+        self.count += 1
+        if self.count > self.size * self.max_load_factor:
+            self._resize(self.size * 2)
+
+    def get(self, key):
+        current = self.table[self.hash_fn(key) % self.size]
+        while current:
+            if current.key == key:
+                return current.value
+            current = current.next
+        return None
+
+    def delete(self, key):
+        index = self.hash_fn(key) % self.size
+        prev, current = None, self.table[index]
+        while current:
+            if current.key == key:
+                if prev:
+                    prev.next = current.next
+                else:
+                    self.table[index] = current.next
+                self.count -= 1
+                return
+            prev, current = current, current.next
+
+    def items(self):
+        for head in self.table:
+            current = head
+            while current:
+                yield current.key, current.value
+                current = current.next
+
+    def _resize(self, new_size):
+        table = [None] * new_size
+        for head in self.table:
+            current = head
+            while current:
+                following = current.next
+                index = self.hash_fn(current.key) % new_size
+                current.next = table[index]
+                table[index] = current
+                current = following
+        self.table, self.size = table, new_size
+
+
+class ArrayChainedHashTable:
+    # Chains stored as slot numbers in parallel arrays; freed slots are reused
+    # through a free list threaded through `nexts`.
+    def __init__(self, size=8, hash_fn=siphash_hash, max_load_factor=1.0):
+        self.size = size
+        self.heads = array('q', [-1]) * size
+        self.keys = []
+        self.values = []
+        self.hashes = array('Q')
+        self.nexts = array('q')
+        self.free = -1
+        self.hash_fn = hash_fn
+        self.max_load_factor = max_load_factor
+        self.count = 0
+
+    def _find(self, key, h):
+        slot = self.heads[h % self.size]
+        keys, hashes, nexts = self.keys, self.hashes, self.nexts
+        while slot != -1:
+            if hashes[slot] == h and keys[slot] == key:
+                return slot
+            slot = nexts[slot]
+        return -1
+
+    def insert(self, key, value):
+        h = self.hash_fn(key)
+        slot = self._find(key, h)
+        if slot != -1:
+            self.values[slot] = value
+            return
+        index = h % self.size
+        if self.free != -1:
+            slot, self.free = self.free, self.nexts[self.free]
+            self.keys[slot], self.values[slot], self.hashes[slot] = key, value, h
+            self.nexts[slot] = self.heads[index]
+        else:
+            slot = len(self.keys)
+            self.keys.append(key)
+            self.values.append(value)
+            self.hashes.append(h)
+            self.nexts.append(self.heads[index])
+        self.heads[index] = slot
+        self.count += 1
+        if self.count > self.size * self.max_load_factor:
+            self._resize(self.size * 2)
+
+    def get(self, key):
+        slot = self._find(key, self.hash_fn(key))
+        return self.values[slot] if slot != -1 else None
+
+    def delete(self, key):
+        h = self.hash_fn(key)
+        index = h % self.size
+        prev, slot = -1, self.heads[index]
+        while slot != -1:
+            if self.hashes[slot] == h and self.keys[slot] == key:
+                if prev == -1:
+                    self.heads[index] = self.nexts[slot]
+                else:
+                    self.nexts[prev] = self.nexts[slot]
+                self.keys[slot] = _EMPTY
+                self.values[slot] = None
+                self.nexts[slot] = self.free
+                self.free = slot
+                self.count -= 1
+                return
+            prev, slot = slot, self.nexts[slot]
+
+    def items(self):
+        for key, value in zip(self.keys, self.values):
+            if key is not _EMPTY:
+                yield key, value
+
+    def _resize(self, new_size):
+        heads = array('q', [-1]) * new_size
+        for slot, key in enumerate(self.keys):
+            if key is not _EMPTY:
+                index = self.hashes[slot] % new_size
+                self.nexts[slot] = heads[index]
+                heads[index] = slot
+        self.heads, self.size = heads, new_size
+
+
+class LinearProbingHashTable:
+    # Open addressing over a power-of-two table; deletes leave tombstones that
+    # are dropped the next time the table is rebuilt.
+    def __init__(self, size=8, hash_fn=siphash_hash, max_load_factor=0.7):
+        self.size = 1 << max(3, (size - 1).bit_length())
+        self.keys = [_EMPTY] * self.size
+        self.values = [None] * self.size
+        self.hash_fn = hash_fn
+        self.max_load_factor = max_load_factor
+        self.count = 0
+        self.tombstones = 0
+
+    def _slot(self, key):
+        mask = self.size - 1
+        keys = self.keys
+        index = self.hash_fn(key) & mask
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1
+            if k is not _TOMBSTONE and k == key:
+                return index
+            index = (index + 1) & mask
+
+    def insert(self, key, value):
+        mask = self.size - 1
+        keys = self.keys
+        index = self.hash_fn(key) & mask
+        reuse = -1
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                break
+            if k is _TOMBSTONE:
+                if reuse == -1:
+                    reuse = index
+            elif k == key:
+                self.values[index] = value
+                return
+            index = (index + 1) & mask
+        if reuse != -1:
+            index = reuse
+            self.tombstones -= 1
+        keys[index] = key
+        self.values[index] = value
+        self.count += 1
+        if self.count + self.tombstones > self.size * self.max_load_factor:
+            self._resize(self.size * 2 if self.count > self.size * self.max_load_factor / 2 else self.size)
+
+    def get(self, key):
+        index = self._slot(key)
+        return self.values[index] if index != -1 else None
+
+    def delete(self, key):
+        index = self._slot(key)
+        if index != -1:
+            self.keys[index] = _TOMBSTONE
+            self.values[index] = None
+            self.count -= 1
+            self.tombstones += 1
+
+    def items(self):
+        for key, value in zip(self.keys, self.values):
+            if key is not _EMPTY and key is not _TOMBSTONE:
+                yield key, value
+
+    def _resize(self, new_size):
+        entries = list(self.items())
+        self.size = new_size
+        self.keys = [_EMPTY] * new_size
+        self.values = [None] * new_size
+        self.count = self.tombstones = 0
+        for key, value in entries:
+            self.insert(key, value)
+
+
+class RobinHoodHashTable:
+    # Linear probing where an insert displaces any entry that sits closer to
+    # its home slot, keeping probe lengths even; deletes shift entries back.
+    def __init__(self, size=8, hash_fn=siphash_hash, max_load_factor=0.9):
+        self.size = 1 << max(3, (size - 1).bit_length())
+        self.keys = [_EMPTY] * self.size
+        self.values = [None] * self.size
+        self.hashes = array('Q', [0]) * self.size
+        self.hash_fn = hash_fn
+        self.max_load_factor = max_load_factor
+        self.count = 0
+
+    def _slot(self, key):
+        mask = self.size - 1
+        keys, hashes = self.keys, self.hashes
+        h = self.hash_fn(key)
+        index, distance = h & mask, 0
+        while True:
+            k = keys[index]
+            if k is _EMPTY or ((index - (hashes[index] & mask)) & mask) < distance:
+                return -1
+            if hashes[index] == h and k == key:
+                return index
+            index = (index + 1) & mask
+            distance += 1
+
+    def insert(self, key, value):
+        existing = self._slot(key)
+        if existing != -1:
+            self.values[existing] = value
+            return
+        if self.count + 1 > self.size * self.max_load_factor:
+            self._resize(self.size * 2)
+        self._place(key, value, self.hash_fn(key))
+        self.count += 1
+
+    def _place(self, key, value, h):
+        mask = self.size - 1
+        keys, values, hashes = self.keys, self.values, self.hashes
+        index, distance = h & mask, 0
+        while True:
+            if keys[index] is _EMPTY:
+                keys[index], values[index], hashes[index] = key, value, h
+                return
+            resident = (index - (hashes[index] & mask)) & mask
+            if resident < distance:
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                hashes[index], h = h, hashes[index]
+                distance = resident
+            index = (index + 1) & mask
+            distance += 1
+
+    def get(self, key):
+        index = self._slot(key)
+        return self.values[index] if index != -1 else None
+
+    def delete(self, key):
+        index = self._slot(key)
+        if index == -1:
+            return
+        mask = self.size - 1
+        keys, values, hashes = self.keys, self.values, self.hashes
+        following = (index + 1) & mask
+        while keys[following] is not _EMPTY and ((following - (hashes[following] & mask)) & mask) > 0:
+            keys[index], values[index], hashes[index] = keys[following], values[following], hashes[following]
+            index, following = following, (following + 1) & mask
+        keys[index], values[index] = _EMPTY, None
+        self.count -= 1
+
+    def items(self):
+        for key, value in zip(self.keys, self.values):
+            if key is not _EMPTY:
+                yield key, value
+
+    def _resize(self, new_size):
+        entries = [(key, value, h) for key, value, h in zip(self.keys, self.values, self.hashes) if key is not _EMPTY]
+        self.size = new_size
+        self.keys = [_EMPTY] * new_size
+        self.values = [None] * new_size
+        self.hashes = array('Q', [0]) * new_size
+        for key, value, h in entries:
+            self._place(key, value, h)
+
+
+BACKENDS = {
+    "__slots__ chains": SlotsChainedHashTable,
+    "Array chains": ArrayChainedHashTable,
+    "Linear probing": LinearProbingHashTable,
+    "Robin Hood": RobinHoodHashTable,
+}
@@ -0,0 +1,146 @@
+import argparse
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from concurrent_hash import GlobalLockHashTable, StripedHashTable
+from hash_backends import BACKENDS
+from hash_functions import siphash_hash
+
+
+def make_keys(n, prefix="key"):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def measure_memory(backend, keys, values, hash_fn):
+    # Keys and values are allocated before tracing starts, so only the
+    # table's own structures are counted
+    tracemalloc.start()
+    table = backend(8, hash_fn)
+    for key, value in zip(keys, values):
+        table.insert(key, value)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return size
+
+
+def measure_throughput(backend, keys, values, misses, hash_fn):
+    timings = {}
+    table = backend(8, hash_fn)
+    start = time.perf_counter()
+    for key, value in zip(keys, values):
+        table.insert(key, value)
+    timings["insert"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        table.get(key)
+    timings["get (hit)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in misses:
+        table.get(key)
+    timings["get (miss)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        table.delete(key)
+    timings["delete"] = time.perf_counter() - start
+    return timings
+
+
+def run_benchmark(backends=None, sizes=(1000, 100000), hash_fn=siphash_hash, memory=True):
+    backends = backends or BACKENDS
+    results = []
+    for n in sizes:
+        keys = make_keys(n)
+        values = list(range(n))
+        misses = make_keys(n, prefix="missing")
+        for name, backend in backends.items():
+            row = {"backend": name, "keys": n}
+            if memory:
+                row["bytes / key"] = measure_memory(backend, keys, values, hash_fn) / n
+            for operation, elapsed in measure_throughput(backend, keys, values, misses, hash_fn).items():
+                row[f"{operation} ops/sec"] = n / elapsed if elapsed else float('inf')
+            results.append(row)
+    return results
+
+
+CONCURRENT_TABLES = {
+    "Striped locks": StripedHashTable,
+    "Global lock": GlobalLockHashTable,
+}
+
+
+def _worker(table, keys, ops, read_fraction, seed, start):
+    rng = random.Random(seed)
+    start.wait()
+    for _ in range(ops):
+        key = keys[rng.randrange(len(keys))]
+        roll = rng.random()
+        if roll < read_fraction:
+            table.get(key)
+        elif roll < (1 + read_fraction) / 2:
+            table.insert(key, roll)
+        else:
+            table.delete(key)
+
+
+def run_concurrent_benchmark(tables=None, thread_counts=(1, 2, 4, 8, 16, 32), read_fractions=(0.5, 0.9),
+                             num_keys=10000, ops_per_thread=20000, hash_fn=siphash_hash):
+    tables = tables or CONCURRENT_TABLES
+    keys = make_keys(num_keys)
+    results = []
+    for read_fraction in read_fractions:
+        for threads in thread_counts:
+            for name, factory in tables.items():
+                table = factory(hash_fn=hash_fn)
+                for i, key in enumerate(keys):
+                    table.insert(key, i)
+                start = threading.Barrier(threads + 1)
+                with ThreadPoolExecutor(max_workers=threads) as pool:
+                    futures = [pool.submit(_worker, table, keys, ops_per_thread, read_fraction, seed, start)
+                               for seed in range(threads)]
+                    start.wait()
+                    began = time.perf_counter()
+                    for future in futures:
+                        future.result()
+                    elapsed = time.perf_counter() - began
+                results.append({
+                    "table": name,
+                    "reads": read_fraction,
+                    "threads": threads,
+                    "ops/sec": threads * ops_per_thread / elapsed,
+                    "contended locks": table.contention,
+                })
+    return results
+
+
+def print_table(results):
+    columns = list(results[0])
+    print("  ".join(f"{column:>17}" for column in columns))
+    for row in results:
+        print("  ".join(f"{row[c]:>17.3f}" if isinstance(row[c], float) else f"{row[c]:>17}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory use and throughput of hash table backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                        help="numbers of keys, e.g. 1000 ... 10000000")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) tracemalloc pass")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="benchmark the thread-safe tables under mixed read/write load instead")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    if args.concurrent:
+        print_table(run_concurrent_benchmark(thread_counts=args.threads))
+    else:
+        print_table(run_benchmark(sizes=args.sizes, memory=not args.no_memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+MASK64 = (1 << 64) - 1
+
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+GOLDEN_64 = 0x9e3779b97f4a7c15
+
+
+def char_sum_hash(key):
+    # The original hash: every anagram collides
+    return sum(ord(char) for char in key)
+
+
+def fnv1a_hash(key):
+    h = FNV_OFFSET
+    for byte in key.encode():
+        h = ((h ^ byte) * FNV_PRIME) & MASK64
+    return h
+
+
+def siphash_hash(key):
+    # str.__hash__ is SipHash, salted per process
+    return hash(key) & MASK64
+
+
+def multiplicative_hash(key):
+    # Knuth/Fibonacci hashing over the whole key: each 8-byte word is folded
+    # in with a multiply and an xor-shift, so keys sharing a long prefix still
+    # differ. The high half of the last product is the well-mixed part.
+    data = key.encode()
+    x = len(data)
+    for i in range(0, len(data), 8):
+        x = ((x ^ int.from_bytes(data[i:i + 8], 'little')) * GOLDEN_64) & MASK64
+        x ^= x >> 29
+    return ((x * GOLDEN_64) & MASK64) >> 32
+
+
+def polynomial_hash(key, base=31):
+    h = 0
+    for char in key:
+        h = (h * base + ord(char)) & MASK64
+    return h
+
+
+HASH_FUNCTIONS = {
+    "Character sum": char_sum_hash,
+    "FNV-1a": fnv1a_hash,
+    "SipHash (hash())": siphash_hash,
+    "Multiplicative": multiplicative_hash,
+    "Polynomial rolling": polynomial_hash,
+}
+
+
+def chain_lengths_for(keys, size, hash_fn):
+    lengths = [0] * size
+    for key in keys:
+        lengths[hash_fn(key) % size] += 1
+    return lengths
+
+
+def chain_summary(lengths):
+    entries = sum(lengths)
+    return {
+        "entries": entries,
+        "load factor": entries / len(lengths) if lengths else 0.0,
+        "max chain": max(lengths, default=0),
+        "empty buckets": sum(1 for length in lengths if length == 0),
+        # Nodes visited by a successful lookup, averaged over all stored keys
+        "avg probes (hit)": sum(n * (n + 1) / 2 for n in lengths) / entries if entries else 0.0,
+    }
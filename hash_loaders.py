@@ -0,0 +1,40 @@
+import csv
+import json
+
+
+def read_csv_records(lines):
+    # Uses the "key"/"value" columns when the file has such a header,
+    # otherwise the first two columns of every row
+    rows = csv.reader(lines)
+    header = next(rows, None)
+    if header is None:
+        return
+    lowered = [column.strip().lower() for column in header]
+    if "key" in lowered:
+        key_col = lowered.index("key")
+        value_col = lowered.index("value") if "value" in lowered else None
+    else:
+        key_col, value_col = 0, 1 if len(header) > 1 else None
+        yield header[key_col], header[value_col] if value_col is not None else None
+    for row in rows:
+        if row:
+            yield row[key_col], row[value_col] if value_col is not None and value_col < len(row) else None
+
+
+def read_jsonl_records(lines):
+    # Each line is either {"key": ..., "value": ...} or a [key, value] pair
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict):
+            yield str(record["key"]), record.get("value")
+        else:
+            yield str(record[0]), record[1] if len(record) > 1 else None
+
+
+def read_records(lines, name):
+    if name.lower().endswith((".jsonl", ".ndjson")):
+        return read_jsonl_records(lines)
+    return read_csv_records(lines)
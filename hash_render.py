@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+from graphviz import Digraph
+from PIL import Image
+
+EMPTY_COLOR = np.array([255, 255, 255])
+FULL_COLOR = np.array([8, 48, 107])
+
+
+def table_header(dot, name, size):
+    fields = '|'.join(f'<{i}> {i}' for i in range(size))
+    dot.node(name, shape='record', label=f'{{{fields}}}')
+
+
+def bucket_fragment(name, table, i, highlight_key=None, migrated=0, limit=None):
+    # DOT lines for one bucket and its chain, built on a scratch graph so
+    # graphviz does the quoting
+    dot = Digraph()
+    bucket_name = f'{name}_bucket_{i}'
+    if table[i] is None:
+        dot.node(bucket_name, 'moved' if i < migrated else 'None', fontcolor='gray' if i < migrated else 'black')
+    else:
+        current = table[i]
+        prev_node = None
+        shown = 0
+        while current:
+            if limit is not None and shown == limit:
+                dot.node(f'{bucket_name}_more', '...', shape='plaintext')
+                dot.edge(prev_node, f'{bucket_name}_more')
+                break
+            node_name = f'{bucket_name}_{current.key}'
+            node_color = 'lightblue' if current.key == highlight_key else 'white'
+            dot.node(node_name, f'{current.key}: {current.value}', style='filled', fillcolor=node_color)
+            if prev_node:
+                dot.edge(prev_node, node_name)
+            else:
+                dot.edge(bucket_name, node_name)
+            prev_node = node_name
+            current = current.next
+            shown += 1
+
+    # Connect hash table to bucket
+    dot.edge(f'{name}:{i}', bucket_name)
+    return dot.body
+
+
+class HashTableRenderer:
+    # Keeps the DOT lines of every bucket and rebuilds only the buckets the
+    # table reports as touched since the previous render.
+    def __init__(self, summary_threshold=200):
+        self.summary_threshold = summary_threshold
+        self.fragments = {}
+        self.tables = {}
+        self.rebuilt = 0
+
+    def summarize(self, hash_table):
+        return hash_table.count > self.summary_threshold
+
+    def _sync(self, name, table, touched):
+        if self.tables.get(name) is not table:
+            self.tables[name] = table
+            for key in [key for key in self.fragments if key[0] == name]:
+                del self.fragments[key]
+            return
+        table_id = id(table)
+        for key in [key for key in self.fragments if key[0] == name and (table_id, key[1]) in touched]:
+            del self.fragments[key]
+
+    def _add_table(self, dot, name, table, size, touched, hash_fn, highlight_key=None, migrated=0):
+        self._sync(name, table, touched)
+        table_header(dot, name, size)
+        highlight_index = hash_fn(highlight_key) % size if highlight_key is not None else None
+        for i in range(size):
+            if i == highlight_index:
+                # Highlighted chains are drawn fresh and never cached
+                dot.body.extend(bucket_fragment(name, table, i, highlight_key, migrated))
+                continue
+            key = (name, i)
+            if key not in self.fragments:
+                self.fragments[key] = bucket_fragment(name, table, i, migrated=migrated)
+                self.rebuilt += 1
+            dot.body.extend(self.fragments[key])
+
+    def render(self, hash_table, highlight_key=None):
+        dot = Digraph(comment='Hash Table with Linked Lists')
+        dot.attr(rankdir='LR')
+        touched = hash_table.touched
+        hash_table.touched = set()
+
+        migrated = hash_table.rehash_index if hash_table.rehashing else 0
+        self._add_table(dot, 'hash_table', hash_table.table, hash_table.size, touched,
+                        hash_table.hash_fn, highlight_key, migrated)
+
+        if hash_table.rehashing:
+            self._add_table(dot, 'new_table', hash_table.new_table, hash_table.new_size, touched,
+                            hash_table.hash_fn, highlight_key)
+            if migrated < hash_table.size:
+                dot.node('rehash_cursor', f'rehash cursor ({migrated}/{hash_table.size})', shape='plaintext', fontcolor='red')
+                dot.edge('rehash_cursor', f'hash_table:{migrated}', color='red')
+        else:
+            self.tables.pop('new_table', None)
+
+        return dot
+
+    def render_chain(self, table, index, highlight_key=None, limit=100):
+        dot = Digraph(comment=f'Bucket {index}')
+        dot.attr(rankdir='LR')
+        dot.node('bucket', shape='record', label=f'<{index}> {index}')
+        dot.body.extend(bucket_fragment('bucket', table, index, highlight_key, limit=limit))
+        return dot
+
+
+def occupancy_heatmap(lengths, width=800, max_cells=512 * 512):
+    # One cell per bucket, coloured by chain length; very large tables are
+    # first averaged down to at most max_cells cells
+    lengths = np.asarray(lengths, dtype=np.float64)
+    per_cell = max(1, math.ceil(len(lengths) / max_cells))
+    if per_cell > 1:
+        padded = np.zeros(math.ceil(len(lengths) / per_cell) * per_cell)
+        padded[:len(lengths)] = lengths
+        lengths = padded.reshape(-1, per_cell).mean(axis=1)
+    cols = max(1, math.ceil(math.sqrt(len(lengths))))
+    rows = max(1, math.ceil(len(lengths) / cols))
+    cells = np.zeros(rows * cols)
+    cells[:len(lengths)] = lengths
+    peak = cells.max() or 1.0
+    shade = (cells / peak).reshape(rows, cols, 1)
+    pixels = (EMPTY_COLOR + (FULL_COLOR - EMPTY_COLOR) * shade).astype(np.uint8)
+    image = Image.fromarray(pixels)
+    scale = max(1, width // cols)
+    return image.resize((cols * scale, rows * scale), Image.NEAREST), per_cell
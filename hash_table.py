@@ -0,0 +1,307 @@
+from itertools import islice
+
+from hash_functions import chain_summary, char_sum_hash
+
+
+class Node:
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.next = None
+
+
+class HashTable:
+    def __init__(self, size, hash_fn=char_sum_hash, auto_resize=True, max_load_factor=1.0,
+                 min_load_factor=0.1, min_size=5, rehash_step=1):
+        self.size = size
+        self.table = [None] * size
+        self.hash_fn = hash_fn
+        self.count = 0
+        self.operations = 0
+        self.probes = 0
+        self.auto_resize = auto_resize
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.min_size = min_size
+        self.rehash_step = rehash_step
+        # While rehashing, buckets below rehash_index have been moved to new_table
+        self.new_table = None
+        self.new_size = 0
+        self.rehash_index = -1
+        # (id(table), index) of buckets changed since the last render
+        self.touched = set()
+        # Bumped on every bucket change; chain lengths are cached per version
+        self.version = 0
+        self._lengths = None
+        self._lengths_version = -1
+
+    @property
+    def rehashing(self):
+        return self.new_table is not None
+
+    def hash_function(self, key):
+        return self.hash_fn(key) % self.size
+
+    def _touch(self, table, index):
+        self.touched.add((id(table), index))
+        self.version += 1
+
+    def _tables(self):
+        yield self.table, self.size
+        if self.rehashing:
+            yield self.new_table, self.new_size
+
+    def resize(self, new_size):
+        if self.rehashing:
+            self.rehash(self.size)
+        if new_size != self.size:
+            self.new_table = [None] * new_size
+            self.new_size = new_size
+            self.rehash_index = 0
+            self.version += 1
+
+    def rehash(self, buckets):
+        # Moves up to `buckets` non-empty buckets (visiting at most ten times as
+        # many empty ones) from the old table to the new one, like Redis does.
+        empty_visits = buckets * 10
+        while buckets and self.rehash_index < self.size:
+            current = self.table[self.rehash_index]
+            self._touch(self.table, self.rehash_index)
+            if current is None:
+                self.rehash_index += 1
+                empty_visits -= 1
+                if empty_visits == 0:
+                    break
+                continue
+            while current:
+                following = current.next
+                index = self.hash_fn(current.key) % self.new_size
+                current.next = self.new_table[index]
+                self.new_table[index] = current
+                self._touch(self.new_table, index)
+                current = following
+            self.table[self.rehash_index] = None
+            self.rehash_index += 1
+            buckets -= 1
+        if self.rehash_index >= self.size:
+            self.table, self.size = self.new_table, self.new_size
+            self.new_table, self.new_size, self.rehash_index = None, 0, -1
+
+    def _before_operation(self):
+        self.operations += 1
+        if self.rehashing:
+            self.rehash(self.rehash_step)
+
+    def _after_update(self):
+        if not self.auto_resize or self.rehashing:
+            return
+        load_factor = self.count / self.size
+        if load_factor > self.max_load_factor:
+            self.resize(self.size * 2)
+        elif load_factor < self.min_load_factor and self.size > self.min_size:
+            self.resize(max(self.min_size, self.size // 2))
+
+    def _insert_into(self, table, index, key, value):
+        self._touch(table, index)
+        if table[index] is None:
+            table[index] = Node(key, value)
+            self.count += 1
+        else:
+            current = table[index]
+            self.probes += 1
+            while current.next:
+                if current.key == key:
+                    current.value = value
+                    return
+                current = current.next
+                self.probes += 1
+            if current.key == key:
+                current.value = value
+            else:
+                current.next = Node(key, value)
+                self.count += 1
+
+    def insert(self, key, value):
+        self._before_operation()
+        if self.rehashing:
+            # The key may still sit in an unmigrated old bucket
+            old_index = self.hash_function(key)
+            current = self.table[old_index]
+            while current:
+                self.probes += 1
+                if current.key == key:
+                    current.value = value
+                    self._touch(self.table, old_index)
+                    return
+                current = current.next
+            self._insert_into(self.new_table, self.hash_fn(key) % self.new_size, key, value)
+        else:
+            self._insert_into(self.table, self.hash_function(key), key, value)
+        self._after_update()
+
+    def get(self, key):
+        self._before_operation()
+        for table, size in self._tables():
+            current = table[self.hash_fn(key) % size]
+            while current:
+                self.probes += 1
+                if current.key == key:
+                    return current.value
+                current = current.next
+        return None
+
+    def _delete_from(self, table, index, key):
+        if table[index] is None:
+            return False
+
+        self.probes += 1
+        if table[index].key == key:
+            table[index] = table[index].next
+            return True
+
+        current = table[index]
+        while current.next:
+            self.probes += 1
+            if current.next.key == key:
+                current.next = current.next.next
+                return True
+            current = current.next
+        return False
+
+    def delete(self, key):
+        self._before_operation()
+        for table, size in self._tables():
+            index = self.hash_fn(key) % size
+            if self._delete_from(table, index, key):
+                self._touch(table, index)
+                self.count -= 1
+                self._after_update()
+                return
+
+    def _prepare_batch(self, incoming=0):
+        # Bulk operations finish any pending migration and grow once up front,
+        # so every key of the batch hashes against a single table.
+        if self.rehashing:
+            self.rehash(self.size)
+        if self.auto_resize and self.count + incoming > self.size * self.max_load_factor:
+            new_size = self.size
+            while self.count + incoming > new_size * self.max_load_factor:
+                new_size *= 2
+            self.resize(new_size)
+            self.rehash(self.size)
+
+    def _group_by_bucket(self, keys):
+        hash_fn, size = self.hash_fn, self.size
+        buckets = {}
+        for key in keys:
+            index = hash_fn(key) % size
+            group = buckets.get(index)
+            if group is None:
+                buckets[index] = [key]
+            else:
+                group.append(key)
+        return buckets
+
+    def insert_many(self, items, batch_size=10000):
+        if hasattr(items, '__len__'):
+            # Size the table for the whole input once instead of doubling per batch
+            self._prepare_batch(len(items))
+        items = iter(items)
+        while True:
+            batch = dict(islice(items, batch_size))
+            if not batch:
+                return
+            self._prepare_batch(len(batch))
+            self.operations += len(batch)
+            table = self.table
+            for index, keys in self._group_by_bucket(batch).items():
+                self._touch(table, index)
+                current = table[index]
+                if current is None and len(keys) == 1:
+                    table[index] = Node(keys[0], batch[keys[0]])
+                    self.count += 1
+                    continue
+                # Walk each chain once, updating keys already present
+                pending = {key: batch[key] for key in keys}
+                tail = None
+                while current:
+                    self.probes += 1
+                    if current.key in pending:
+                        current.value = pending.pop(current.key)
+                    tail, current = current, current.next
+                for key, value in pending.items():
+                    node = Node(key, value)
+                    if tail:
+                        tail.next = node
+                    else:
+                        table[index] = node
+                    tail = node
+                    self.count += 1
+
+    def get_many(self, keys):
+        keys = list(keys)
+        self._prepare_batch()
+        self.operations += len(keys)
+        found = {}
+        for index, bucket_keys in self._group_by_bucket(set(keys)).items():
+            wanted = set(bucket_keys)
+            current = self.table[index]
+            while current and wanted:
+                self.probes += 1
+                if current.key in wanted:
+                    found[current.key] = current.value
+                    wanted.discard(current.key)
+                current = current.next
+        return [found.get(key) for key in keys]
+
+    def delete_many(self, keys):
+        keys = set(keys)
+        self._prepare_batch()
+        self.operations += len(keys)
+        deleted = 0
+        for index, bucket_keys in self._group_by_bucket(keys).items():
+            doomed = set(bucket_keys)
+            prev, current = None, self.table[index]
+            while current and doomed:
+                self.probes += 1
+                if current.key in doomed:
+                    doomed.discard(current.key)
+                    self._touch(self.table, index)
+                    if prev:
+                        prev.next = current.next
+                    else:
+                        self.table[index] = current.next
+                    deleted += 1
+                else:
+                    prev = current
+                current = current.next
+        self.count -= deleted
+        self._after_update()
+        return deleted
+
+    def items(self):
+        for table, _ in self._tables():
+            for head in table:
+                current = head
+                while current:
+                    yield current.key, current.value
+                    current = current.next
+
+    def chain_lengths(self):
+        if self._lengths_version == self.version:
+            return self._lengths
+        lengths = []
+        for table, _ in self._tables():
+            for head in table:
+                length, current = 0, head
+                while current:
+                    length += 1
+                    current = current.next
+                lengths.append(length)
+        self._lengths, self._lengths_version = lengths, self.version
+        return lengths
+
+    def stats(self):
+        stats = chain_summary(self.chain_lengths())
+        stats["avg probes / op"] = self.probes / self.operations if self.operations else 0.0
+        return stats
@@ -0,0 +1,97 @@
+import json
+import os
+
+import numpy as np
+
+
+def distance_array(graph, source):
+    # Full single-source distances as an array, inf where unreachable
+    dist, _, _ = graph.dijkstra(source)
+    distances = np.full(graph.num_nodes, np.inf)
+    distances[np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))] = list(dist.values())
+    return distances
+
+
+def choose_landmarks(graph, count, method='farthest', seed=None):
+    # Farthest-point selection: each new landmark is the node farthest from
+    # all landmarks chosen so far, starting from the node farthest from a
+    # random one. Returns the landmarks with their outgoing distance arrays,
+    # which the index needs anyway.
+    rng = np.random.default_rng(seed)
+    n = graph.num_nodes
+    count = min(count, n)
+    if method == 'random':
+        landmarks = [int(v) for v in rng.choice(n, count, replace=False)]
+        return landmarks, [distance_array(graph, v) for v in landmarks]
+
+    landmarks, distances = [], []
+    closest = distance_array(graph, int(rng.integers(n)))
+    while len(landmarks) < count:
+        # Nodes no landmark reaches yet (inf) come first, then the farthest
+        candidate = int(np.argmax(closest))
+        if candidate in landmarks:
+            break
+        landmarks.append(candidate)
+        distances.append(distance_array(graph, candidate))
+        closest = distances[-1] if len(landmarks) == 1 else np.minimum(closest, distances[-1])
+    return landmarks, distances
+
+
+class LandmarkIndex:
+    # ALT preprocessing: distances from every landmark (on the graph) and to
+    # every landmark (from the reversed graph), stored node-major so the
+    # bound for one node reads one contiguous row of each array.
+    def __init__(self, landmarks, from_landmarks, to_landmarks, fingerprint):
+        self.landmarks = landmarks
+        self.from_landmarks = from_landmarks
+        self.to_landmarks = to_landmarks
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, graph, count=8, method='farthest', seed=None):
+        landmarks, outgoing = choose_landmarks(graph, count, method, seed)
+        reverse = graph.reverse()
+        incoming = [distance_array(reverse, v) for v in landmarks]
+        return cls(landmarks, np.column_stack(outgoing), np.column_stack(incoming), graph.fingerprint())
+
+    def matches(self, graph):
+        return self.fingerprint == graph.fingerprint()
+
+    def heuristic(self, graph, target):
+        # Triangle inequality with every landmark L:
+        #   d(v, t) >= d(L, t) - d(L, v)   and   d(v, t) >= d(v, L) - d(t, L)
+        # The nan from inf - inf (L reaches neither node) never compares
+        # greater, and an inf bound only comes up when v cannot reach target.
+        # With a handful of landmarks a plain loop beats numpy's per-call cost.
+        from_target = self.from_landmarks[target].tolist()
+        to_target = self.to_landmarks[target].tolist()
+        from_rows, to_rows = self.from_landmarks, self.to_landmarks
+
+        def estimate(v):
+            bound = 0.0
+            for lt, lv, vl, tl in zip(from_target, from_rows[v].tolist(), to_rows[v].tolist(), to_target):
+                if lt - lv > bound:
+                    bound = lt - lv
+                if vl - tl > bound:
+                    bound = vl - tl
+            return bound
+
+        return estimate
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'from_landmarks.npy'), self.from_landmarks)
+        np.save(os.path.join(directory, 'to_landmarks.npy'), self.to_landmarks)
+        with open(os.path.join(directory, 'landmarks.json'), 'w') as f:
+            json.dump({"landmarks": self.landmarks, "fingerprint": self.fingerprint}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        # Memory-maps the distance arrays, so loading is instant whatever the size
+        mode = 'r' if mmap else None
+        with open(os.path.join(directory, 'landmarks.json')) as f:
+            meta = json.load(f)
+        return cls(meta["landmarks"],
+                   np.load(os.path.join(directory, 'from_landmarks.npy'), mmap_mode=mode),
+                   np.load(os.path.join(directory, 'to_landmarks.npy'), mmap_mode=mode),
+                   meta["fingerprint"])
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+def render_key(source, format, engine='dot', neato_no_op=None):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (engine, format, str(neato_no_op), source):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class RenderCache:
+    # Rendered Graphviz output keyed by a hash of the DOT source, format and
+    # engine. Memory holds the most recently used renders up to max_bytes;
+    # evicted renders spill to disk_dir when one is given. One instance is
+    # shared by every session, so all access goes through one lock.
+    def __init__(self, max_bytes=64 * 2 ** 20, disk_dir=None, disk_max_bytes=512 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+            }
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key)
+
+    def _store(self, key, data):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return
+        if len(data) > self.max_bytes:
+            self._spill(key, data)
+            return
+        self.entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            old_key, old_data = self.entries.popitem(last=False)
+            self.bytes -= len(old_data)
+            self.evictions += 1
+            self._spill(old_key, old_data)
+
+    def _spill(self, key, data):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            # Write then rename so a reader in another process never sees half a file
+            temp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+            self._trim_disk()
+
+    def _trim_disk(self):
+        # Oldest files go first; other processes may be trimming the same directory
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.tmp'):
+                continue
+            try:
+                info = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((info.st_mtime, info.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            total -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _load_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def __contains__(self, key):
+        # Presence check that leaves the hit and miss counts alone
+        with self.lock:
+            return key in self.entries or bool(self.disk_dir) and os.path.exists(self._disk_path(key))
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return data
+            data = self._load_disk(key)
+            if data is not None:
+                self.disk_hits += 1
+                self._store(key, data)
+            return data
+
+    def put(self, key, data):
+        # Stores a render made elsewhere; every put follows a miss
+        with self.lock:
+            self.misses += 1
+            self._store(key, data)
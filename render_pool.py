@@ -0,0 +1,235 @@
+import os
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import streamlit as st
+
+from graph_layout import layout_dot, parse_plain
+from render_cache import RenderCache, render_key
+
+
+class RenderJob:
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self.process = None
+        self.cancelled = False
+
+
+class RenderPool:
+    # Runs graphviz in a few background threads, one subprocess each. Every
+    # session renders into its own slot; submitting a new job for a slot
+    # cancels the one it replaces, killing its subprocess if it already
+    # started, so fast widget changes never queue up stale layouts.
+    def __init__(self, cache, max_workers=2, timeout=30.0):
+        self.cache = cache
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='graphviz')
+        self.latest = {}
+        self.prefetching = {}
+        self.max_prefetch = 4 * max_workers
+        self.lock = threading.Lock()
+        self.cancelled = 0
+        self.timeouts = 0
+        self.prefetched = 0
+
+    def submit(self, slot, dot, format='png', neato_no_op=None):
+        key = render_key(dot.source, format, dot.engine, neato_no_op)
+        with self.lock:
+            previous = self.latest.get(slot)
+            if previous is not None and previous.key == key and not previous.cancelled:
+                return previous
+            job = RenderJob(key)
+            self.latest[slot] = job
+        if previous is not None:
+            self._cancel(previous)
+
+        data = self.cache.get(key)
+        if data is not None:
+            # Done already, so it is not kept in latest, which would pin the
+            # output in memory for as long as the session lives
+            job.future = Future()
+            job.future.set_result(data)
+            self._release(slot, job)
+            return job
+        with self.lock:
+            ahead = self.prefetching.get(key)
+        if ahead is not None:
+            # Already rendering in the background: wait on that instead of
+            # starting again. Cancelling this job only drops the wrapper.
+            job.future = Future()
+            job.future.add_done_callback(lambda _: self._release(slot, job))
+            ahead.future.add_done_callback(lambda done: _forward(done, job.future))
+            return job
+        job.future = self.executor.submit(self._run, slot, job, _command(dot, format, neato_no_op),
+                                          dot.source.encode(dot.encoding))
+        return job
+
+    def prefetch(self, dot, format='png', neato_no_op=None):
+        # Renders into the cache ahead of need, outside any slot, so a newer
+        # submit never cancels it. Skipped when the output is cached or
+        # queued already, or when max_prefetch renders are waiting.
+        key = render_key(dot.source, format, dot.engine, neato_no_op)
+        if key in self.cache:
+            return False
+        with self.lock:
+            if key in self.prefetching or len(self.prefetching) >= self.max_prefetch:
+                return False
+            # The future is set before the job is visible to submit, which
+            # chains onto it
+            job = RenderJob(key)
+            job.future = self.executor.submit(self._run, None, job, _command(dot, format, neato_no_op),
+                                              dot.source.encode(dot.encoding))
+            self.prefetching[key] = job
+            self.prefetched += 1
+        return True
+
+    def _cancel(self, job):
+        job.cancelled = True
+        if job.future is not None and not job.future.cancel():
+            process = job.process
+            if process is not None:
+                process.kill()
+        with self.lock:
+            self.cancelled += 1
+
+    def _run(self, slot, job, command, source):
+        try:
+            if job.cancelled:
+                raise CancelledError
+            job.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                           stderr=subprocess.PIPE)
+            if job.cancelled:
+                job.process.kill()
+            try:
+                data, errors = job.process.communicate(source, timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                job.process.kill()
+                job.process.communicate()
+                with self.lock:
+                    self.timeouts += 1
+                raise
+            if job.cancelled:
+                raise CancelledError
+            if job.process.returncode != 0:
+                raise RuntimeError(errors.decode(errors='replace').strip() or f'{command[0]} failed')
+            self.cache.put(job.key, data)
+            return data
+        finally:
+            self._release(slot, job)
+
+    def _release(self, slot, job):
+        with self.lock:
+            if self.latest.get(slot) is job:
+                del self.latest[slot]
+            if self.prefetching.get(job.key) is job:
+                del self.prefetching[job.key]
+
+
+def _command(dot, format, neato_no_op):
+    command = [dot.engine, f'-T{format}']
+    if neato_no_op:
+        command.append('-n' if neato_no_op is True else f'-n{neato_no_op}')
+    return command
+
+
+def _forward(done, future):
+    # Copies the outcome of a prefetch into a waiting job's future, unless
+    # that job was cancelled in the meantime
+    try:
+        if done.cancelled():
+            future.cancel()
+        elif done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+    except InvalidStateError:
+        pass
+
+
+def await_render(job, placeholder, previous=None, message="Rendering graph", poll=0.1):
+    # Keeps the previous image (or a notice) on screen until the job is done.
+    # Updating the page on every poll lets Streamlit stop this run as soon as
+    # a widget change starts a newer one. Returns the output, or None.
+    if not job.future.done():
+        if previous is not None:
+            placeholder.image(previous, caption=f"{message}...", use_column_width=True)
+        else:
+            placeholder.info(f"{message}...")
+        began = time.perf_counter()
+        status = st.empty()
+        while not job.future.done():
+            try:
+                job.future.result(timeout=poll)
+            except FutureTimeout:
+                status.caption(f"{message}... {time.perf_counter() - began:.1f} s")
+            except Exception:
+                break
+        status.empty()
+    try:
+        return job.future.result()
+    except CancelledError:
+        return None
+    except subprocess.TimeoutExpired as error:
+        placeholder.error(f"{message} timed out after {error.timeout:.0f} s")
+    except (OSError, RuntimeError) as error:
+        placeholder.error(f"{message} failed: {error}")
+    return None
+
+
+@st.cache_resource
+def get_render_pool():
+    # One pool and cache per server process, shared by all sessions
+    return RenderPool(RenderCache(disk_dir=os.environ.get("RENDER_CACHE_DIR")))
+
+
+def session_slot():
+    # Each session renders into its own slot of the shared pool
+    return st.session_state.setdefault("render_slot", uuid.uuid4().hex)
+
+
+def show_graph(graph, build_dot, caption, file_name, prefetch=()):
+    # Lays out graph once, then draws build_dot() with the nodes pinned to
+    # that layout, plus a download button. Layout and rendering run in the
+    # worker pool; the previous image stays up meanwhile and a newer rerun
+    # cancels whatever this one started. prefetch is an iterable of further
+    # dots to render into the cache, consumed only once the layout exists.
+    # Returns the dot that was drawn.
+    render_pool = get_render_pool()
+    slot = session_slot()
+    placeholder = st.empty()
+    previous = st.session_state.get("last_png")
+    if graph.positions is None:
+        plain = await_render(render_pool.submit(slot, layout_dot(graph.nodes, graph.edges), format='plain'),
+                             placeholder, previous, "Laying out graph")
+        if plain is not None:
+            graph.positions = parse_plain(plain.decode('utf-8'))
+
+    dot = build_dot()
+    png_data = None
+    if graph.positions is not None:
+        job = render_pool.submit(slot, dot, format='png', neato_no_op=True)
+        for ahead in prefetch:
+            render_pool.prefetch(ahead, format='png', neato_no_op=True)
+        png_data = await_render(job, placeholder, previous)
+    if png_data is not None:
+        st.session_state.last_png = png_data
+        placeholder.image(png_data, caption=caption, use_column_width=True)
+
+        st.download_button(
+            label="Download Graph as PNG",
+            data=png_data,
+            file_name=file_name,
+            mime="image/png"
+        )
+
+    stats = render_pool.cache.stats()
+    st.sidebar.caption(f"Render cache: {stats['hits'] + stats['disk hits']} hits, {stats['misses']} misses, "
+                       f"{stats['evictions']} evictions, {stats['bytes'] / 1024:.0f} KiB. "
+                       f"Render pool: {render_pool.prefetched} prefetched, {render_pool.cancelled} cancelled, "
+                       f"{render_pool.timeouts} timed out")
+    return dot
@@ -0,0 +1,85 @@
+import hashlib
+import re
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+
+
+def fingerprint(arr):
+    data = np.ascontiguousarray(arr, dtype=np.int64)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+def parse_targets(text):
+    return [int(token) for token in re.findall(r'-?\d+', text)]
+
+
+def binary_search_steps(arr, targets):
+    # Runs the binary_search loop for every target in lockstep and returns the
+    # index it would report (-1 if absent) and the number of steps it yields.
+    n = len(arr)
+    left = np.zeros(len(targets), dtype=np.int64)
+    right = np.full(len(targets), n - 1, dtype=np.int64)
+    index = np.full(len(targets), -1, dtype=np.int64)
+    steps = np.zeros(len(targets), dtype=np.int64)
+    active = left <= right
+    while active.any():
+        mid = (left + right) // 2
+        steps += active
+        probe = arr[np.where(active, mid, 0)]
+        hit = active & (probe == targets)
+        index[hit] = mid[hit]
+        go_right = active & ~hit & (probe < targets)
+        go_left = active & ~hit & (probe > targets)
+        left[go_right] = mid[go_right] + 1
+        right[go_left] = mid[go_left] - 1
+        active = active & ~hit & (left <= right)
+    return index, steps
+
+
+def batch_search(arr, targets):
+    arr = np.asarray(arr, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if len(arr) == 0:
+        return np.zeros(len(targets), dtype=bool), np.full(len(targets), -1), np.zeros(len(targets), dtype=np.int64)
+    index, steps = binary_search_steps(arr, targets)
+    return index != -1, index, steps
+
+
+class BatchSearchCache:
+    # Memoizes (list fingerprint, target) -> (found, index, steps) so that a
+    # rerun with the same list only searches targets it has not seen yet.
+    # Keeps the max_lists most recently searched lists, and for each at most
+    # max_targets results, dropping the oldest first.
+    def __init__(self, max_lists=8, max_targets=100000):
+        self.max_lists = max_lists
+        self.max_targets = max_targets
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, arr, targets, count=True):
+        # count=False leaves the hit and miss counts alone, for lookups the
+        # page repeats on every rerun
+        key = fingerprint(arr)
+        results = self.results.get(key)
+        if results is None:
+            results = self.results[key] = {}
+            if len(self.results) > self.max_lists:
+                self.results.popitem(last=False)
+        else:
+            self.results.move_to_end(key)
+        targets = list(dict.fromkeys(targets))
+        missing = [t for t in targets if t not in results]
+        if count:
+            self.hits += len(targets) - len(missing)
+            self.misses += len(missing)
+        found = {t: results[t] for t in targets if t in results}
+        if missing:
+            hit, index, steps = batch_search(arr, missing)
+            for t, f, i, s in zip(missing, hit.tolist(), index.tolist(), steps.tolist()):
+                found[t] = results[t] = (f, i, s)
+            for t in list(islice(results, max(0, len(results) - self.max_targets))):
+                del results[t]
+        return {t: found[t] for t in targets}
@@ -0,0 +1,81 @@
+import argparse
+import time
+
+import numpy as np
+
+from search_strategies import STRATEGIES, run_search
+
+
+def uniform_keys(rng, n):
+    return np.sort(rng.integers(0, 10 * n, size=n))
+
+
+def skewed_keys(rng, n):
+    return np.sort((rng.pareto(1.2, size=n) * n).astype(np.int64))
+
+
+def clustered_keys(rng, n):
+    centers = rng.integers(0, 100 * n, size=max(1, n // 1000))
+    keys = rng.choice(centers, size=n) + rng.normal(0, 50, size=n).astype(np.int64)
+    return np.sort(keys)
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform_keys,
+    "skewed": skewed_keys,
+    "clustered": clustered_keys,
+}
+
+
+def make_queries(rng, keys, num_queries):
+    # Half of the queries hit existing keys, half are drawn from the key range
+    hits = rng.choice(keys, size=num_queries // 2)
+    misses = rng.integers(keys[0], keys[-1] + 1, size=num_queries - len(hits))
+    queries = np.concatenate((hits, misses))
+    rng.shuffle(queries)
+    return queries.tolist()
+
+
+def run_benchmark(strategies=None, distributions=None, sizes=(1000, 100000), num_queries=1000, seed=0):
+    strategies = strategies or list(STRATEGIES)
+    distributions = distributions or list(DISTRIBUTIONS)
+    rng = np.random.default_rng(seed)
+    results = []
+    for distribution in distributions:
+        for size in sizes:
+            keys = DISTRIBUTIONS[distribution](rng, size).tolist()
+            queries = make_queries(rng, keys, num_queries)
+            for name in strategies:
+                search = STRATEGIES[name]
+                probes = 0
+                start = time.perf_counter()
+                for query in queries:
+                    probes += run_search(search, keys, query)[1]
+                elapsed = time.perf_counter() - start
+                results.append({
+                    "distribution": distribution,
+                    "size": size,
+                    "strategy": name,
+                    "probes / query": probes / num_queries,
+                    "queries / sec": num_queries / elapsed,
+                })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare search strategies across key distributions")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--distributions", nargs="+", choices=list(DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_benchmark(distributions=args.distributions, sizes=args.sizes, num_queries=args.queries, seed=args.seed)
+    print(f"{'distribution':<12} {'size':>10} {'strategy':<22} {'probes/query':>13} {'queries/sec':>12}")
+    for row in results:
+        print(f"{row['distribution']:<12} {row['size']:>10} {row['strategy']:<22} "
+              f"{row['probes / query']:>13.2f} {row['queries / sec']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+def binary_search(arr, target, left=0, right=None):
+    right = len(arr) - 1 if right is None else right
+    while left <= right:
+        mid = (left + right) // 2
+        yield arr, left, mid, right
+        if arr[mid] == target:
+            return mid
+        elif arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    return -1
+
+
+def interpolation_search(arr, target):
+    left, right = 0, len(arr) - 1
+    while left <= right and arr[left] <= target <= arr[right]:
+        low, high = int(arr[left]), int(arr[right])
+        if high == low:
+            mid = left
+        else:
+            mid = left + (int(target) - low) * (right - left) // (high - low)
+        yield arr, left, mid, right
+        if arr[mid] == target:
+            return mid
+        elif arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    return -1
+
+
+def exponential_search(arr, target):
+    # Gallops through indices 1, 2, 4, ... until it passes the target, then
+    # binary searches the last doubling interval.
+    n = len(arr)
+    if n == 0:
+        return -1
+    yield arr, 0, 0, n - 1
+    if arr[0] == target:
+        return 0
+    if arr[0] > target:
+        return -1
+    bound = 1
+    while bound < n:
+        yield arr, bound, bound, n - 1
+        if arr[bound] == target:
+            return bound
+        if arr[bound] > target:
+            break
+        bound *= 2
+    return (yield from binary_search(arr, target, bound // 2 + 1, min(bound, n) - 1))
+
+
+def ternary_search(arr, target):
+    left, right = 0, len(arr) - 1
+    while left <= right:
+        third = (right - left) // 3
+        mid1, mid2 = left + third, right - third
+        yield arr, left, mid1, right
+        if arr[mid1] == target:
+            return mid1
+        yield arr, left, mid2, right
+        if arr[mid2] == target:
+            return mid2
+        if target < arr[mid1]:
+            right = mid1 - 1
+        elif target > arr[mid2]:
+            left = mid2 + 1
+        else:
+            left, right = mid1 + 1, mid2 - 1
+    return -1
+
+
+def fibonacci_search(arr, target):
+    n = len(arr)
+    fib2, fib1 = 0, 1
+    fib = fib1 + fib2
+    while fib < n:
+        fib2, fib1 = fib1, fib
+        fib = fib1 + fib2
+    offset = -1
+    while fib > 1 and offset + 1 < n:
+        mid = min(offset + fib2, n - 1)
+        yield arr, offset + 1, mid, min(offset + fib, n - 1)
+        if arr[mid] < target:
+            fib, fib1 = fib1, fib2
+            fib2 = fib - fib1
+            offset = mid
+        elif arr[mid] > target:
+            fib, fib1 = fib2, fib1 - fib2
+            fib2 = fib - fib1
+        else:
+            return mid
+    if fib1 and offset + 1 < n:
+        yield arr, offset + 1, offset + 1, offset + 1
+        if arr[offset + 1] == target:
+            return offset + 1
+    return -1
+
+
+STRATEGIES = {
+    "Binary Search": binary_search,
+    "Interpolation Search": interpolation_search,
+    "Exponential Search": exponential_search,
+    "Ternary Search": ternary_search,
+    "Fibonacci Search": fibonacci_search,
+}
+
+
+def run_search(search, arr, target):
+    # Drains a search generator and returns (index, steps, last_frame)
+    steps, frame = 0, None
+    frames = search(arr, target)
+    while True:
+        try:
+            frame = next(frames)
+        except StopIteration as stop:
+            return stop.value, steps, frame
+        steps += 1
@@ -0,0 +1,180 @@
+import math
+import time
+from collections import OrderedDict
+from heapq import heappop, heappush
+
+import numpy as np
+
+from graph_csr import path_from
+
+INF = float('inf')
+
+
+# Heuristics are factories: heuristic(graph, target) returns a function giving
+# a lower bound on the distance from a node to target.
+
+def zero_heuristic(graph, target):
+    return lambda v: 0
+
+
+def heuristic_scale(graph):
+    # Largest factor that keeps straight-line distance below every edge
+    # weight, so the Euclidean bound stays admissible and consistent
+    if getattr(graph, '_heuristic_scale', None) is None:
+        coords = np.asarray(graph.coords)
+        straight = np.hypot(*(coords[graph.sources()] - coords[np.asarray(graph.targets)]).T)
+        moving = straight > 0
+        ratios = np.asarray(graph.weights)[moving] / straight[moving]
+        graph._heuristic_scale = float(ratios.min()) if len(ratios) else 0.0
+    return graph._heuristic_scale
+
+
+def euclidean_heuristic(graph, target):
+    if graph.coords is None:
+        return zero_heuristic(graph, target)
+    scale = heuristic_scale(graph)
+    xs, ys = graph.coords[:, 0], graph.coords[:, 1]
+    tx, ty = float(xs[target]), float(ys[target])
+    return lambda v: scale * math.hypot(xs[v] - tx, ys[v] - ty)
+
+
+HEURISTICS = {
+    "Euclidean": euclidean_heuristic,
+    "Zero (plain Dijkstra)": zero_heuristic,
+}
+
+
+# Every search keeps its state in dicts created per call, so any number of
+# queries can run on the same graph at once. Each returns
+# (path, distance, settled_count); the path is [] when target is unreachable.
+
+def dijkstra(graph, source, target):
+    dist, parent, settled = graph.dijkstra(source, target)
+    return path_from(parent, target), dist.get(target), len(settled)
+
+
+def bidirectional_dijkstra(graph, source, target):
+    # Forward search from source and backward search (on the reversed graph)
+    # from target, always advancing the side with the smaller frontier key.
+    # Stops once the two smallest keys together reach the best meeting cost.
+    if source == target:
+        return [source], 0, 1
+    graphs = (graph, graph.reverse())
+    dist = ({source: 0}, {target: 0})
+    parent = ({source: -1}, {target: -1})
+    settled = (set(), set())
+    heaps = ([(0, source)], [(0, target)])
+    best, meet = INF, None
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heappop(heaps[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+        here, there = dist[side], dist[1 - side]
+        targets, weights = graphs[side].neighbors(u)
+        for v, w in zip(targets.tolist(), weights.tolist()):
+            nd = d + w
+            if nd < here.get(v, INF):
+                here[v] = nd
+                parent[side][v] = u
+                heappush(heaps[side], (nd, v))
+                if v in there and nd + there[v] < best:
+                    best, meet = nd + there[v], v
+    settled_count = len(settled[0]) + len(settled[1])
+    if meet is None:
+        return [], None, settled_count
+    # parent[1] points from each node towards target
+    path = path_from(parent[0], meet)
+    node = parent[1][meet]
+    while node != -1:
+        path.append(node)
+        node = parent[1][node]
+    return path, best, settled_count
+
+
+def astar(graph, source, target, heuristic=euclidean_heuristic):
+    estimate = heuristic(graph, target)
+    dist = {source: 0}
+    parent = {source: -1}
+    settled = set()
+    heap = [(estimate(source), 0, source)]
+    while heap:
+        _, d, u = heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u == target:
+            break
+        targets, weights = graph.neighbors(u)
+        for v, w in zip(targets.tolist(), weights.tolist()):
+            nd = d + w
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                parent[v] = u
+                heappush(heap, (nd + estimate(v), nd, v))
+    return path_from(parent, target), dist.get(target), len(settled)
+
+
+MODES = {
+    "Dijkstra": lambda graph, source, target, heuristic: dijkstra(graph, source, target),
+    "Bidirectional Dijkstra": lambda graph, source, target, heuristic: bidirectional_dijkstra(graph, source, target),
+    "A*": astar,
+}
+
+
+def run_query(graph, mode, source, target, heuristic=euclidean_heuristic):
+    start = time.perf_counter()
+    path, distance, settled = MODES[mode](graph, source, target, heuristic)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "distance": distance,
+        "settled nodes": settled,
+        "ms": elapsed * 1000,
+        "path": path,
+    }
+
+
+def compare_modes(graph, source, target, modes=None, heuristic=euclidean_heuristic):
+    # One row per mode for the same query, without the paths
+    rows = []
+    for mode in modes or MODES:
+        row = run_query(graph, mode, source, target, heuristic)
+        del row["path"]
+        rows.append(row)
+    return rows
+
+
+class ShortestPathTreeCache:
+    # LRU of full single-source shortest-path trees keyed by (graph version,
+    # source). Trees of an older version are never asked for again and age
+    # out like any other entry.
+    def __init__(self, max_trees=32):
+        self.max_trees = max_trees
+        self.trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def tree(self, version, source, compute):
+        # compute(source) -> (dist, parent) runs only on a miss
+        key = (version, source)
+        if key in self.trees:
+            self.trees.move_to_end(key)
+            self.hits += 1
+            return self.trees[key]
+        self.misses += 1
+        tree = compute(source)
+        self.trees[key] = tree
+        if len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+            self.evictions += 1
+        return tree
@@ -0,0 +1,145 @@
+import numpy as np
+
+from sort_trace import SortTrace
+
+
+class Sortedness:
+    # Number of adjacent descents a[k] > a[k+1], updated locally after each
+    # swap so that "is it sorted yet?" never needs a full O(n) scan.
+    def __init__(self, arr):
+        self.arr = arr
+        self.descents = int(np.count_nonzero(arr[:-1] > arr[1:]))
+
+    def _pairs(self, indices):
+        n = len(self.arr)
+        return {k for i in indices for k in (i - 1, i) if 0 <= k < n - 1}
+
+    def _count(self, pairs):
+        arr = self.arr
+        return sum(1 for k in pairs if arr[k] > arr[k + 1])
+
+    def swap(self, i, j):
+        pairs = self._pairs((i, j))
+        self.descents -= self._count(pairs)
+        self.arr[i], self.arr[j] = self.arr[j], self.arr[i]
+        self.descents += self._count(pairs)
+
+    @property
+    def is_sorted(self):
+        return self.descents == 0
+
+
+def _as_array(values):
+    return np.array(values, dtype=np.int64)
+
+
+def selection_sort(values):
+    arr = _as_array(values)
+    trace = SortTrace(arr)
+    order = Sortedness(arr)
+    n = len(arr)
+    for i in range(n - 1):
+        if order.is_sorted:
+            break
+        min_idx = i + int(np.argmin(arr[i:]))
+        trace.count_compares(n - i - 1)
+        if min_idx != i:
+            order.swap(i, min_idx)
+            trace.record_swap(i, min_idx)
+    return trace
+
+
+def insertion_sort(values):
+    arr = _as_array(values)
+    trace = SortTrace(arr)
+    for i in range(1, len(arr)):
+        value = arr[i]
+        trace.count_compares(1)
+        if arr[i - 1] <= value:
+            continue
+        # The prefix is sorted, so the insertion point is a binary search away
+        pos = int(np.searchsorted(arr[:i], value, side='right'))
+        trace.count_compares(max(1, i.bit_length()))
+        arr[pos + 1:i + 1] = arr[pos:i].copy()
+        arr[pos] = value
+        trace.record_rotate(pos, i)
+    return trace
+
+
+def merge_sort(values):
+    arr = _as_array(values)
+    trace = SortTrace(arr)
+    n = len(arr)
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            mid, hi = lo + width, min(lo + 2 * width, n)
+            trace.count_compares(1)
+            if arr[mid - 1] <= arr[mid]:
+                continue
+            trace.count_compares(hi - lo - 2)
+            arr[lo:hi] = np.sort(arr[lo:hi], kind='stable')
+            trace.record_merge(lo, mid, hi)
+        width *= 2
+    return trace
+
+
+def heap_sort(values):
+    arr = _as_array(values)
+    trace = SortTrace(arr)
+    heap = arr.tolist()  # Element-wise access is much faster on a list
+    n = len(heap)
+
+    def sift_down(root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end:
+                trace.count_compares(1)
+                if heap[child + 1] > heap[child]:
+                    child += 1
+            trace.count_compares(1)
+            if heap[root] >= heap[child]:
+                return
+            heap[root], heap[child] = heap[child], heap[root]
+            trace.record_swap(root, child)
+            root = child
+
+    for root in range(n // 2 - 1, -1, -1):
+        sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        heap[0], heap[end] = heap[end], heap[0]
+        trace.record_swap(0, end)
+        sift_down(0, end)
+    arr[:] = heap
+    return trace
+
+
+def quick_sort(values):
+    arr = _as_array(values)
+    trace = SortTrace(arr)
+    stack = [(0, len(arr))]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        segment = arr[lo:hi]
+        pivot = int(np.median(segment[[0, (hi - lo) // 2, -1]]))
+        less = segment[segment < pivot]
+        greater = segment[segment > pivot]
+        trace.count_compares(2 * (hi - lo))
+        arr[lo:hi] = np.concatenate((less, np.full(hi - lo - len(less) - len(greater), pivot), greater))
+        trace.record_partition(lo, hi, pivot)
+        stack.append((lo, lo + len(less)))
+        stack.append((hi - len(greater), hi))
+    return trace
+
+
+SORTS = {
+    "Selection Sort": selection_sort,
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort,
+    "Heap Sort": heap_sort,
+    "Quick Sort": quick_sort,
+}
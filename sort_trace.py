@@ -0,0 +1,143 @@
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+SWAP = 1
+ROTATE = 2     # move the element at `second` to `first`, shifting the rest right
+MERGE = 3      # merge the sorted runs [first, third) and [third, second)
+PARTITION = 4  # three-way partition of [first, second) around the value `third`
+
+CHECKPOINT_SPACING = 1024  # Moved elements between snapshots, per array element
+
+
+def apply_event(state, kind, first, second, third):
+    if kind == SWAP:
+        state[first], state[second] = state[second], state[first]
+    elif kind == ROTATE:
+        value = state[second]
+        state[first + 1:second + 1] = state[first:second]
+        state[first] = value
+    elif kind == MERGE:
+        np.frombuffer(state, dtype=np.int64)[first:second].sort(kind='stable')
+    elif kind == PARTITION:
+        segment = np.frombuffer(state, dtype=np.int64)[first:second]
+        segment[:] = np.concatenate((segment[segment < third], segment[segment == third],
+                                     segment[segment > third]))
+
+
+def move_cost(kind, first, second):
+    # Elements a move rewrites; rotates, merges and partitions cost O(n)
+    if kind == SWAP:
+        return 2
+    return second - first + 1 if kind == ROTATE else second - first
+
+
+class SortTrace:
+    # Stores the initial array plus a stream of events instead of a full copy
+    # per step. A snapshot is kept every `checkpoint_every` moved elements or
+    # `max(64, n)` moves, whichever comes first, so any step is rebuilt by
+    # replaying a bounded amount of work whether the moves are swaps or
+    # whole-run rotates and merges.
+    def __init__(self, initial, checkpoint_every=None):
+        self.initial = array('q', initial.tolist() if hasattr(initial, 'tolist') else initial)
+        self.kinds = array('b')
+        self.first = array('i')
+        self.second = array('i')
+        self.third = array('q')
+        self.move_steps = array('q')
+        self.num_compares = 0
+        self.checkpoint_every = checkpoint_every or CHECKPOINT_SPACING * max(64, len(self.initial))
+        self._checkpoints = [array('q', self.initial)]
+        self._checkpoint_steps = array('q', [0])
+        self._checkpoint_moves = array('q', [0])
+        self._moved_since_checkpoint = 0
+        self._max_moves_between = max(64, len(self.initial))
+        self._working = array('q', self.initial)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def num_moves(self):
+        return len(self.move_steps)
+
+    def _append(self, kind, first, second, third=0):
+        self.kinds.append(kind)
+        self.first.append(first)
+        self.second.append(second)
+        self.third.append(third)
+
+    def count_compares(self, count):
+        # Comparisons are only counted; the event stream holds moves
+        self.num_compares += count
+
+    def _record_move(self, kind, first, second, third=0):
+        self.move_steps.append(len(self.kinds))
+        self._append(kind, first, second, third)
+        apply_event(self._working, kind, first, second, third)
+        self._moved_since_checkpoint += move_cost(kind, first, second)
+        if (self._moved_since_checkpoint >= self.checkpoint_every
+                or self.num_moves - self._checkpoint_moves[-1] >= self._max_moves_between):
+            self._checkpoints.append(array('q', self._working))
+            self._checkpoint_steps.append(len(self.kinds))
+            self._checkpoint_moves.append(self.num_moves)
+            self._moved_since_checkpoint = 0
+
+    def record_swap(self, i, j):
+        self._record_move(SWAP, i, j)
+
+    def record_rotate(self, i, j):
+        self._record_move(ROTATE, i, j)
+
+    def record_merge(self, lo, mid, hi):
+        self._record_move(MERGE, lo, hi, mid)
+
+    def record_partition(self, lo, hi, pivot):
+        self._record_move(PARTITION, lo, hi, pivot)
+
+    def _replay(self, state, start, stop):
+        # Applies moves start..stop-1 (0-based move numbers) to `state`
+        kinds, first, second, third = self.kinds, self.first, self.second, self.third
+        for s in range(start, stop):
+            e = self.move_steps[s]
+            apply_event(state, kinds[e], first[e], second[e], third[e])
+
+    def state_at(self, step):
+        # Array contents after the first `step` events have been applied
+        step = max(0, min(step, len(self)))
+        if step == len(self):
+            return self.final_state()
+        c = bisect_right(self._checkpoint_steps, step) - 1
+        state = array('q', self._checkpoints[c])
+        self._replay(state, self._checkpoint_moves[c], bisect_right(self.move_steps, step - 1))
+        return state.tolist()
+
+    def state_after_move(self, k):
+        # Array contents right after the k-th move (1-based); 0 is the initial array
+        if k <= 0:
+            return self.initial.tolist()
+        if k >= self.num_moves:
+            return self.final_state()
+        return self.state_at(self.move_steps[min(k, self.num_moves) - 1] + 1)
+
+    def moved_indices(self, k):
+        e = self.move_steps[k - 1]
+        kind, first, second = self.kinds[e], self.first[e], self.second[e]
+        if kind == SWAP:
+            return first, second
+        return range(first, second + 1) if kind == ROTATE else range(first, second)
+
+    def final_state(self):
+        return self._working.tolist()
+
+    def frames(self, start=1, stop=None):
+        # Yields (state, moved_indices) for moves start..stop. The same array
+        # is mutated in place between frames, so copy it if you need to keep it.
+        stop = self.num_moves if stop is None else min(stop, self.num_moves)
+        if start > stop:
+            return
+        state = array('q', self.state_after_move(start - 1))
+        for k in range(start, stop + 1):
+            self._replay(state, k - 1, k)
+            yield state, self.moved_indices(k)
@@ -0,0 +1,172 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from search_strategies import binary_search, run_search
+
+DTYPE = np.dtype('<i8')
+BLOCK_SIZE = 4096 // DTYPE.itemsize  # One 4 KiB page of keys per leaf block
+
+
+def fences_path(path):
+    return f'{path}.fences.npy'
+
+
+def _write_replacing(path, write):
+    # Writes through a temporary file beside path and renames it into place,
+    # so a memory map of the old file stays valid in readers that hold one
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def write_sorted_file(path, n, max_gap=10, chunk_size=1 << 20, seed=None):
+    # Streams a sorted file of n int64 keys to disk without holding it in RAM,
+    # and the first key of every block beside it for the block indexes
+    rng = np.random.default_rng(seed)
+    fences = []
+
+    def write_keys(f):
+        last = 0
+        for start in range(0, n, chunk_size):
+            gaps = rng.integers(0, max_gap + 1, size=min(chunk_size, n - start), dtype=np.int64)
+            chunk = last + np.cumsum(gaps)
+            chunk.astype(DTYPE).tofile(f)
+            fences.append(chunk[(-start) % BLOCK_SIZE::BLOCK_SIZE])
+            last = int(chunk[-1])
+
+    _write_replacing(path, write_keys)
+    fences = np.concatenate(fences).astype(DTYPE) if fences else np.empty(0, DTYPE)
+    _write_replacing(fences_path(path), lambda f: np.save(f, fences))
+
+
+def open_sorted_file(path):
+    return np.memmap(path, dtype=DTYPE, mode='r')
+
+
+def load_fences(path, values):
+    # Reading values[::BLOCK_SIZE] touches every page of the file, so it is
+    # done at most once per file: files written elsewhere get the sidecar on
+    # first use
+    sidecar = fences_path(path)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(path):
+        return np.load(sidecar)
+    fences = np.array(values[::BLOCK_SIZE])
+    _write_replacing(sidecar, lambda f: np.save(f, fences))
+    return fences
+
+
+def _predecessor(arr, target):
+    # Index of the last element <= target, found with binary_search
+    index, steps, frame = run_search(binary_search, arr, target)
+    if index != -1:
+        return index, steps
+    if frame is None:
+        return -1, steps
+    _, _, mid, _ = frame
+    return (mid if arr[mid] < target else mid - 1), steps
+
+
+def _eytzinger_order(n):
+    # order[k] is the sorted rank stored at BFS position k (1-based, order[0] unused)
+    order = np.zeros(n + 1, dtype=np.int64)
+    stack, k, rank = [], 1, 0
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k *= 2
+        k = stack.pop()
+        order[k] = rank
+        rank += 1
+        k = 2 * k + 1
+    return order
+
+
+class BinaryLayout:
+    name = "Binary search"
+
+    def __init__(self, values):
+        self.values = values
+
+    def search(self, target):
+        index, steps, _ = run_search(binary_search, self.values, target)
+        return index, steps
+
+
+class BlockedLayout:
+    # B-tree style: a small in-RAM array of the first key of every page-sized
+    # block, searched first, so the file itself is only touched in one block.
+    name = "Blocked (B-tree) index"
+
+    def __init__(self, values, block_size=BLOCK_SIZE, fences=None):
+        self.values = values
+        self.block_size = block_size
+        self.fences = np.array(values[::block_size]) if fences is None else fences
+
+    def _block(self, target):
+        return _predecessor(self.fences, target)
+
+    def search(self, target):
+        block, comparisons = self._block(target)
+        if block < 0:
+            return -1, comparisons
+        lo = block * self.block_size
+        index, steps, _ = run_search(binary_search, self.values[lo:lo + self.block_size], target)
+        return (lo + index if index != -1 else -1), comparisons + steps
+
+
+class EytzingerLayout(BlockedLayout):
+    # Same leaf blocks, but the fence keys are stored in BFS (Eytzinger) order
+    # so the top-level descent walks memory front to back.
+    name = "Eytzinger index"
+
+    def __init__(self, values, block_size=BLOCK_SIZE, fences=None):
+        super().__init__(values, block_size, fences)
+        order = _eytzinger_order(len(self.fences))
+        self.tree = [0] + self.fences[order[1:]].tolist()
+        self.rank = order
+
+    def _block(self, target):
+        tree, n = self.tree, len(self.tree) - 1
+        k, comparisons = 1, 0
+        while k <= n:
+            comparisons += 1
+            k = 2 * k + (tree[k] <= target)
+        # Drop the trailing right turns to land on the first fence > target
+        k >>= ((k + 1) & ~k).bit_length()
+        first_greater = self.rank[k] if k else n
+        return int(first_greater) - 1, comparisons
+
+
+def open_layouts(path):
+    # Every layout over one memory map; the block layouts share the fences
+    values = open_sorted_file(path)
+    fences = load_fences(path, values)
+    return [BinaryLayout(values), BlockedLayout(values, fences=fences), EytzingerLayout(values, fences=fences)]
+
+
+def compare_layouts(layouts, targets):
+    results = []
+    for layout in layouts:
+        comparisons = 0
+        found = 0
+        start = time.perf_counter()
+        for target in targets:
+            index, steps = layout.search(target)
+            comparisons += steps
+            found += index != -1
+        elapsed = time.perf_counter() - start
+        results.append({
+            "layout": layout.name,
+            "found": found,
+            "comparisons / query": comparisons / max(1, len(targets)),
+            "µs / query": 1e6 * elapsed / max(1, len(targets)),
+        })
+    return results
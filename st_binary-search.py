@@ -1,94 +1,94 @@
 import streamlit as st
+import os
 import random
+from collections import Counter
+from search_batch import BatchSearchCache, parse_targets
+from search_bench import DISTRIBUTIONS, run_benchmark
+from search_strategies import STRATEGIES, binary_search
+from sorted_mmap import compare_layouts, open_layouts, write_sorted_file
+from step_timeline import emit_css, frame_html, grid_html, show_grid, show_timeline
 
 def generate_sorted_list(size):
     return sorted(random.sample(range(1, 101), size))
 
-def binary_search(arr, target):
-    left, right = 0, len(arr) - 1
-    while left <= right:
-        mid = (left + right) // 2
-        yield arr, left, mid, right
-        if arr[mid] == target:
-            return mid
-        elif arr[mid] < target:
-            left = mid + 1
-        else:
-            right = mid - 1
-    return -1
+@st.cache_resource
+def load_layouts(path, mtime):
+    # mtime is only part of the cache key, so a regenerated file is reopened
+    return open_layouts(path)
 
 st.set_page_config(layout="wide")
-st.title("Binary Search Visualization")
 
 # Sidebar for user input
 st.sidebar.header("Settings")
+strategy = st.sidebar.selectbox("Search strategy", list(STRATEGIES))
 size = st.sidebar.slider("Select list size", min_value=10, max_value=50, value=20)
 target = st.sidebar.number_input("Enter target number", min_value=1, max_value=100, value=50)
 highlight_color = st.sidebar.color_picker("Choose highlight color", "#00FF00")
 text_color = st.sidebar.color_picker("Choose text color for highlighted boxes", "#000000")
 show_initial_mid = st.sidebar.checkbox("Show initial middle element", value=True)
 
+st.sidebar.header("Batch Queries")
+pasted_targets = st.sidebar.text_area("Paste target numbers (any separator)")
+num_random_targets = st.sidebar.number_input("Number of random targets", min_value=1, max_value=100000, value=1000)
+
+st.sidebar.header("Large Dataset")
+dataset_path = st.sidebar.text_input("Sorted int64 file", value="sorted_keys.bin")
+dataset_entries = st.sidebar.number_input("Entries to generate", min_value=1000, max_value=1000000000, value=10000000)
+if st.sidebar.button("Generate Sorted File"):
+    with st.spinner(f"Writing {dataset_entries} keys to {dataset_path}..."):
+        write_sorted_file(dataset_path, dataset_entries)
+
+st.sidebar.header("Strategy Benchmark")
+bench_distributions = st.sidebar.multiselect("Key distributions", list(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+bench_sizes = st.sidebar.multiselect("List sizes", [1000, 10000, 100000, 1000000], default=[1000, 100000])
+bench_queries = st.sidebar.number_input("Queries per run", min_value=10, max_value=100000, value=1000)
+if st.sidebar.button("Run Benchmark"):
+    with st.spinner("Benchmarking search strategies..."):
+        st.session_state.bench_results = run_benchmark(
+            distributions=bench_distributions, sizes=bench_sizes, num_queries=bench_queries)
+
+st.title(f"{strategy} Visualization")
+
 # Generate sorted list
 if 'numbers' not in st.session_state or st.sidebar.button("Generate New List"):
     st.session_state.numbers = generate_sorted_list(size)
 
-# Function to display list with highlighted section
-def display_list(arr, left, mid, right, step_num=None, show_mid=True):
-    max_cols = 25  # Maximum number of columns before wrapping
-    num_cols = min(len(arr), max_cols)
-    
-    grid_html = f"""
-    <style>
-        .number-grid {{
-            display: grid;
-            grid-template-columns: repeat({num_cols}, 1fr);
-            gap: 5px;
-        }}
-        .number-box {{
-            border: 1px solid black;
-            padding: 5px;
-            text-align: center;
-            font-size: 0.8em;
-        }}
-        .highlighted {{
-            background-color: {highlight_color};
-            color: {text_color};
-        }}
-        .mid {{
-            border: 2px solid red;
-        }}
-    </style>
-    <div class="number-grid">
-    """
-    
-    for i, num in enumerate(arr):
-        class_name = "number-box"
-        if left <= i <= right:
-            class_name += " highlighted"
-        if show_mid and i == mid:
-            class_name += " mid"
-        grid_html += f'<div class="{class_name}">{num}</div>'
-    
-    grid_html += "</div>"
-    
-    st.markdown(grid_html, unsafe_allow_html=True)
-    
-    if step_num is not None:
-        st.write(f"Step {step_num}: Searching between index {left} and {right}. Middle index: {mid}")
-    st.write("")  # Add some space between steps
+if 'search_cache' not in st.session_state:
+    st.session_state.search_cache = BatchSearchCache()
+search_cache = st.session_state.search_cache
+
+if st.sidebar.button("Generate Random Targets"):
+    st.session_state.random_targets = [random.randint(1, 100) for _ in range(num_random_targets)]
+
+emit_css(len(st.session_state.numbers), highlight_color, text_color)
+
+def search_classes(left, mid, right, show_mid=True):
+    classes = {i: "highlighted" for i in range(max(left, 0), right + 1)}
+    if show_mid and mid >= 0:
+        classes[mid] = classes.get(mid, "") + " mid"
+    return classes
+
+def render_search_window(steps, start, stop):
+    for k in range(start, stop + 1):
+        arr, left, mid, right = steps[k - 1]
+        caption = f"Step {k}: Searching between index {left} and {right}. Probe index: {mid}"
+        yield frame_html(grid_html(arr, search_classes(left, mid, right)), caption)
 
 # Display original list
 st.subheader("Original Sorted List")
 initial_mid = len(st.session_state.numbers) // 2 if show_initial_mid else -1
-display_list(st.session_state.numbers, 0, initial_mid, len(st.session_state.numbers)-1, show_mid=show_initial_mid)
+show_grid(st.session_state.numbers, search_classes(0, initial_mid, len(st.session_state.numbers)-1, show_mid=show_initial_mid))
 
-# Binary search visualization
-if st.button("Start Binary Search"):
-    search_steps = list(binary_search(st.session_state.numbers, target))
-    
-    st.subheader(f"Binary Search Steps (Searching for {target})")
-    for i, (arr, left, mid, right) in enumerate(search_steps):
-        display_list(arr, left, mid, right, i+1)
+# Search visualization
+if st.button(f"Start {strategy}"):
+    st.session_state.search_steps = list(STRATEGIES[strategy](st.session_state.numbers, target))
+    st.session_state.search_key = (st.session_state.numbers, target, strategy)
+
+search_key = st.session_state.get("search_key")
+if search_key is not None and search_key[0] is st.session_state.numbers and search_key[1:] == (target, strategy):
+    search_steps = st.session_state.search_steps
+    st.subheader(f"{strategy} Steps (Searching for {target})")
+    show_timeline(len(search_steps), lambda start, stop: render_search_window(search_steps, start, stop), key="search_steps")
     
     if search_steps:
         last_step = search_steps[-1]
@@ -103,9 +103,52 @@ if st.button("Start Binary Search"):
 
 # Display final result
 st.subheader("Final Result")
-result = binary_search(st.session_state.numbers, target)
-final_result = next(result)
-if st.session_state.numbers[final_result[2]] == target:
-    st.write(f"Target {target} found at index {final_result[2]}")
+found, index, steps = search_cache.search(st.session_state.numbers, [target], count=False)[target]
+if found:
+    st.write(f"Target {target} found at index {index}")
 else:
-    st.write(f"Target {target} not found in the list")
\ No newline at end of file
+    st.write(f"Target {target} not found in the list")
+
+# Batch queries
+batch_targets = parse_targets(pasted_targets) + st.session_state.get("random_targets", [])
+if batch_targets:
+    st.subheader(f"Batch Queries ({len(batch_targets)} targets)")
+    results = search_cache.search(st.session_state.numbers, batch_targets)
+    hits = sum(1 for t in batch_targets if results[t][0])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Hits", hits)
+    col2.metric("Misses", len(batch_targets) - hits)
+    col3.metric("Cache hit rate", f"{search_cache.hits / max(1, search_cache.hits + search_cache.misses):.0%}")
+
+    step_counts = Counter(results[t][2] for t in batch_targets)
+    st.write("Steps per query")
+    st.bar_chart({"queries": [step_counts.get(k, 0) for k in range(max(step_counts) + 1)]})
+
+    unique_targets = list(results)
+    st.dataframe({
+        "target": unique_targets,
+        "found": [results[t][0] for t in unique_targets],
+        "index": [results[t][1] for t in unique_targets],
+        "steps": [results[t][2] for t in unique_targets],
+    })
+
+    # Per-target traces are only built for the row being inspected
+    inspected = st.selectbox("Inspect target", unique_targets)
+    inspected_steps = list(binary_search(st.session_state.numbers, inspected))
+    show_timeline(len(inspected_steps), lambda start, stop: render_search_window(inspected_steps, start, stop), key="batch_steps")
+
+# Large memory-mapped dataset
+if dataset_path and os.path.exists(dataset_path):
+    layouts = load_layouts(dataset_path, os.path.getmtime(dataset_path))
+    values = layouts[0].values
+    st.subheader(f"Large Dataset ({len(values):,} keys, memory-mapped)")
+    if len(values):
+        dataset_targets = batch_targets or [target]
+        if not batch_targets:
+            st.write(f"Searching for {target}; paste or generate batch targets to compare layouts on more queries.")
+        st.dataframe(compare_layouts(layouts, dataset_targets))
+
+# Strategy benchmark
+if st.session_state.get("bench_results"):
+    st.subheader("Strategy Benchmark")
+    st.dataframe(st.session_state.bench_results)
@@ -1,28 +1,31 @@
 import streamlit as st
 import random
+import time
+from sort_engine import SORTS
+from step_timeline import emit_css, frame_html, grid_html, show_grid, show_timeline
+
+GRID_LIMIT = 200  # Largest list drawn as a grid of boxes
+CHART_POINTS = 1000  # Bars drawn for lists above GRID_LIMIT
 
 def generate_random_list(size):
     return [random.randint(1, 100) for _ in range(size)]
 
-def selection_sort(arr):
-    n = len(arr)
-    for i in range(n - 1):
-        min_idx = i
-        for j in range(i + 1, n):
-            if arr[j] < arr[min_idx]:
-                min_idx = j
-        if min_idx != i:
-            arr[i], arr[min_idx] = arr[min_idx], arr[i]
-            yield arr.copy(), (i, min_idx)
-        elif all(arr[k] <= arr[k+1] for k in range(len(arr)-1)):
-            break
+def show_values(arr, extra_classes=None, caption=None):
+    if len(arr) <= GRID_LIMIT:
+        show_grid(arr, extra_classes, caption)
+    else:
+        # Too many boxes to be readable; plot a downsampled bar chart instead
+        stride = max(1, len(arr) // CHART_POINTS)
+        st.bar_chart(list(arr)[::stride])
+        if caption:
+            st.write(caption)
 
 st.set_page_config(layout="wide")
-st.title("Selection Sort Visualization")
 
 # Sidebar for user input
 st.sidebar.header("Settings")
-size = st.sidebar.slider("Select list size", min_value=2, max_value=50, value=32)
+algorithm = st.sidebar.selectbox("Sorting algorithm", list(SORTS))
+size = st.sidebar.slider("Select list size", min_value=2, max_value=100000, value=32)
 highlight_color = st.sidebar.color_picker("Choose highlight color", "#FFFF00")
 text_color = st.sidebar.color_picker("Choose text color for highlighted boxes", "#000000")
 
@@ -30,61 +33,44 @@ text_color = st.sidebar.color_picker("Choose text color for highlighted boxes",
 if 'numbers' not in st.session_state or st.sidebar.button("Generate New List"):
     st.session_state.numbers = generate_random_list(size)
 
-# Function to display list in a grid
-def display_list(arr, step_num=None, swapped_indices=None):
-    max_cols = 25  # Maximum number of columns before wrapping
-    num_cols = min(len(arr), max_cols)
-    
-    grid_html = f"""
-    <style>
-        .number-grid {{
-            display: grid;
-            grid-template-columns: repeat({num_cols}, 1fr);
-            gap: 5px;
-        }}
-        .number-box {{
-            border: 1px solid black;
-            padding: 5px;
-            text-align: center;
-            font-size: 0.8em;
-        }}
-        .swapped {{
-            background-color: {highlight_color};
-            color: {text_color};
-        }}
-    </style>
-    <div class="number-grid">
-    """
-    
-    for i, num in enumerate(arr):
-        class_name = "number-box swapped" if swapped_indices and i in swapped_indices else "number-box"
-        grid_html += f'<div class="{class_name}">{num}</div>'
-    
-    grid_html += "</div>"
-    
-    st.markdown(grid_html, unsafe_allow_html=True)
-    
-    if step_num is not None:
-        st.write(f"Step {step_num}")
-    st.write("")  # Add some space between steps
+st.title(f"{algorithm} Visualization")
+
+emit_css(len(st.session_state.numbers), highlight_color, text_color)
+
+def swap_classes(moved_indices):
+    return {i: "swapped" for i in moved_indices} if moved_indices else None
+
+def render_sort_window(trace, start, stop):
+    for k, (step, moved) in enumerate(trace.frames(start, stop), start):
+        yield frame_html(grid_html(step, swap_classes(moved)), f"Step {k}")
 
 # Display original list
 st.subheader("Original List")
-display_list(st.session_state.numbers)
+show_values(st.session_state.numbers)
 
 # Sorting visualization
 if st.button("Start Sorting"):
-    sorting_steps = list(selection_sort(st.session_state.numbers.copy()))
-    
+    start_time = time.perf_counter()
+    st.session_state.trace = SORTS[algorithm](st.session_state.numbers)
+    st.session_state.sort_time = time.perf_counter() - start_time
+    st.session_state.trace_source = (st.session_state.numbers, algorithm)
+
+trace = st.session_state.get("trace")
+source_list, source_algorithm = st.session_state.get("trace_source", (None, None))
+if trace is not None and source_list is st.session_state.numbers and source_algorithm == algorithm:
     st.subheader("Sorting Steps")
-    for i, (step, swapped) in enumerate(sorting_steps):
-        display_list(step, i+1, swapped)
+    if len(trace.initial) <= GRID_LIMIT:
+        show_timeline(trace.num_moves, lambda start, stop: render_sort_window(trace, start, stop), key="sort_steps")
+    elif trace.num_moves:
+        step = st.slider("Step", min_value=0, max_value=trace.num_moves, value=trace.num_moves)
+        show_values(trace.state_after_move(step), caption=f"Step {step}")
     
-    if not sorting_steps:
+    if not trace.num_moves:
         st.write("The list was already sorted!")
     else:
-        st.write(f"Sorting completed in {len(sorting_steps)} steps.")
+        st.write(f"Sorting completed in {trace.num_moves} steps ({trace.num_compares} comparisons, "
+                 f"{st.session_state.sort_time:.3f}s).")
     
 # Display final sorted list
 st.subheader("Final Sorted List")
-display_list(sorted(st.session_state.numbers))
\ No newline at end of file
+show_values(sorted(st.session_state.numbers))
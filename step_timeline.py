@@ -0,0 +1,72 @@
+import streamlit as st
+
+MAX_COLS = 25  # Maximum number of columns before wrapping
+
+
+def grid_css(num_cols, highlight_color, text_color):
+    return f"""
+    <style>
+        .number-grid {{
+            display: grid;
+            grid-template-columns: repeat({min(num_cols, MAX_COLS)}, 1fr);
+            gap: 5px;
+        }}
+        .number-box {{
+            border: 1px solid black;
+            padding: 5px;
+            text-align: center;
+            font-size: 0.8em;
+        }}
+        .highlighted, .swapped {{
+            background-color: {highlight_color};
+            color: {text_color};
+        }}
+        .mid {{
+            border: 2px solid red;
+        }}
+        .step-caption {{
+            margin: 0.25em 0 1em 0;
+        }}
+    </style>
+    """
+
+
+def emit_css(num_cols, highlight_color, text_color):
+    # Once per rerun; every grid rendered afterwards reuses these classes
+    st.markdown(grid_css(num_cols, highlight_color, text_color), unsafe_allow_html=True)
+
+
+def grid_html(arr, extra_classes=None):
+    extra_classes = extra_classes or {}
+    boxes = [
+        f'<div class="number-box {extra_classes[i]}">{num}</div>' if i in extra_classes
+        else f'<div class="number-box">{num}</div>'
+        for i, num in enumerate(arr)
+    ]
+    return '<div class="number-grid">' + "".join(boxes) + "</div>"
+
+
+def frame_html(grid, caption=None):
+    if caption is None:
+        return grid
+    return grid + f'<p class="step-caption">{caption}</p>'
+
+
+def show_grid(arr, extra_classes=None, caption=None):
+    st.markdown(frame_html(grid_html(arr, extra_classes), caption), unsafe_allow_html=True)
+
+
+def show_timeline(num_steps, render_window, key, page_size=10):
+    # render_window(start, stop) yields the HTML of steps start..stop (1-based,
+    # inclusive). Only the visible page is built and sent to the browser.
+    if num_steps <= 0:
+        return
+    page_size = st.select_slider("Steps per page", options=[5, 10, 25, 50, 100], value=page_size, key=f"{key}_page_size")
+    num_pages = (num_steps + page_size - 1) // page_size
+    page = 1
+    if num_pages > 1:
+        page = st.slider("Page", min_value=1, max_value=num_pages, value=1, key=f"{key}_page")
+    start = (page - 1) * page_size + 1
+    stop = min(start + page_size - 1, num_steps)
+    st.caption(f"Showing steps {start}-{stop} of {num_steps}")
+    st.markdown("".join(render_window(start, stop)), unsafe_allow_html=True)
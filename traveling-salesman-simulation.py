@@ -1,108 +1,91 @@
 import streamlit as st
-import random
-from graphviz import Digraph
 import io
+import os
+import time
 from queue import PriorityQueue
-
-class Node:
-    def __init__(self, name):
-        self.name = name
-
-class Graph:
-    def __init__(self):
-        self.nodes = {}
-        self.edges = {}
-
-    def add_node(self, name):
-        self.nodes[name] = Node(name)
-
-    def add_edge(self, start, end, weight):
-        if start not in self.edges:
-            self.edges[start] = {}
-        self.edges[start][end] = weight
-        if end not in self.edges:
-            self.edges[end] = {}
-        self.edges[end][start] = weight  # Make the graph undirected
-
-    def get_graphviz(self, bg_color, box_color, node_color, edge_color, path_color, zoom_level, path=None):
-        dot = Digraph(comment='Traveling Salesman Problem Visualization')
-        dot.attr(engine='neato')
-        
-        width, height = 22 * zoom_level, 17 * zoom_level
-        size = f"{width},{height}"
-        dot.attr(rankdir='LR', bgcolor=bg_color, size=size, dpi="60")
-        
-        with dot.subgraph(name='cluster_bg') as c:
-            c.attr(style='filled,rounded', color=box_color, fillcolor=box_color, penwidth='2')
-            c.attr(label='', fontcolor="#00000000")
-
-        node_size = max(0.3, 0.8 / zoom_level)
-        dot.attr('node', shape='circle', style='filled', fontcolor='black', fontname='Arial', 
-                 fontsize=str(max(10, int(20 / zoom_level))), width=str(node_size), height=str(node_size), fixedsize='true')
-        
-        edge_len = max(1.0, 2.0 * zoom_level)
-        dot.attr('edge', fontname='Arial', fontsize=str(max(8, int(16 / zoom_level))), len=str(edge_len))
-
-        for name in self.nodes:
-            dot.node(name, name, fillcolor=node_color)
-
-        for start, ends in self.edges.items():
-            for end, weight in ends.items():
-                if path and start in path and end in path and (path.index(end) == path.index(start) + 1 or path.index(start) == path.index(end) + 1):
-                    dot.edge(start, end, label=str(weight), color=path_color, penwidth='3', dir='both')
-                else:
-                    dot.edge(start, end, label=str(weight), color=edge_color, penwidth='2', dir='both')
-
-        return dot
-
-    def get_mermaid(self, path=None):
-        mermaid_code = ["graph LR"]
-        for start, ends in self.edges.items():
-            for end, weight in ends.items():
-                if path and start in path and end in path and (path.index(end) == path.index(start) + 1 or path.index(start) == path.index(end) + 1):
-                    mermaid_code.append(f"    {start}-->{end}")
-                    mermaid_code.append(f"    style {start} fill:#ff0000")
-                    mermaid_code.append(f"    style {end} fill:#ff0000")
-                else:
-                    mermaid_code.append(f"    {start}--{weight}-->{end}")
-        return "\n".join(mermaid_code)
-
-    def nearest_neighbor_tsp(self, start):
-        unvisited = set(self.nodes.keys())
-        path = [start]
-        unvisited.remove(start)
-        total_distance = 0
-
-        while unvisited:
-            nearest = min(unvisited, key=lambda x: self.edges[path[-1]].get(x, float('inf')))
-            path.append(nearest)
-            total_distance += self.edges[path[-2]][nearest]
-            unvisited.remove(nearest)
-
-        # Return to start
-        path.append(start)
-        total_distance += self.edges[path[-2]][start]
-
-        return path, total_distance
-
-def create_random_graph(num_nodes, max_weight):
-    graph = Graph()
-    nodes = [chr(65 + i) for i in range(num_nodes)]
-    for node in nodes:
-        graph.add_node(node)
-    
-    for i in range(num_nodes):
-        for j in range(i+1, num_nodes):
-            weight = random.randint(1, max_weight)
-            graph.add_edge(nodes[i], nodes[j], weight)
-    
-    return graph
+from render_pool import show_graph
+from PIL import Image, ImageDraw
+from tsp_core import TSPInstance, random_euclidean, nearest_neighbor_tour, tour_length, load_tsplib
+from tsp_exact import solve_exact
+from tsp_local import local_search, multi_start
+from tsp_graph import create_random_graph
+
+def draw_tour(instance, tour, path_color, size=800):
+    # Large instances are drawn straight from their coordinates; graphviz
+    # cannot lay out thousands of nodes interactively
+    coords = instance.coords
+    low = coords.min(axis=0)
+    span = (coords.max(axis=0) - low).max() or 1.0
+    points = (coords - low) / span * (size - 20) + 10
+    image = Image.new("RGB", (size, size), "white")
+    draw = ImageDraw.Draw(image)
+    draw.line([tuple(points[i]) for i in tour], fill=path_color, width=1)
+    radius = 2 if len(instance) <= 2000 else 1
+    for x, y in points:
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill="black")
+    return image
+
+def show_large_instance(path_color):
+    st.sidebar.header("Large Instance")
+    source = st.sidebar.radio("Cities", ["Random Euclidean", "TSPLIB File"])
+    if source == "Random Euclidean":
+        num_cities = st.sidebar.number_input("Number of Cities", 10, 100000, 1000, step=100)
+        if st.sidebar.button("Generate Cities"):
+            st.session_state.large_instance = random_euclidean(int(num_cities))
+    else:
+        uploaded = st.sidebar.file_uploader("TSPLIB .tsp file", type=["tsp"])
+        if uploaded is not None and st.session_state.get("large_source") != uploaded.file_id:
+            try:
+                st.session_state.large_instance = load_tsplib(io.TextIOWrapper(uploaded, encoding="utf-8"))
+                st.session_state.large_source = uploaded.file_id
+            except (KeyError, ValueError) as error:
+                st.sidebar.error(f"Could not read TSPLIB file: {error}")
+
+    instance = st.session_state.get("large_instance")
+    if instance is None:
+        return
+    st.header(f"Large Instance {instance.name}".rstrip())
+    # The greedy tour is solved once per instance, not on every rerun
+    greedy = st.session_state.get("large_greedy")
+    if greedy is None or greedy[0] is not instance:
+        start = time.perf_counter()
+        tour = nearest_neighbor_tour(instance)
+        elapsed = time.perf_counter() - start
+        greedy = (instance, tour, tour_length(instance, tour), elapsed)
+        st.session_state.large_greedy = greedy
+    _, tour, length, elapsed = greedy
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cities", len(instance))
+    col2.metric("Nearest Neighbor Length", f"{length:,.1f}")
+    col3.metric("Solve Time", f"{elapsed * 1000:.0f} ms")
+    st.subheader("Multi-start Local Search")
+    st.write("Runs nearest neighbor from every city and improves each tour with 2-opt and Or-opt "
+             "in parallel worker processes, keeping the best tour found within the time budget.")
+    col1, col2 = st.columns(2)
+    time_budget = col1.slider("Time Budget (s)", 1, 120, 10)
+    workers = col2.number_input("Worker Processes", 1, 64, os.cpu_count() or 1)
+    if st.button("Run Multi-start Search"):
+        best_tour, best_length, curve, completed = multi_start(instance, time_budget, workers=int(workers))
+        st.session_state.large_result = (instance, best_tour, best_length, curve, completed)
+
+    result = st.session_state.get("large_result")
+    if result is not None and result[0] is instance:
+        _, tour, best_length, curve, completed = result
+        col1, col2 = st.columns(2)
+        col1.metric("Best Length", f"{best_length:,.1f}")
+        col2.metric("Starts Completed", completed)
+        st.line_chart({"seconds": [t for t, _ in curve], "best length": [length for _, length in curve]},
+                      x="seconds", y="best length")
+
+    if instance.coords is not None:
+        caption = "Best multi-start tour" if result is not None and result[0] is instance else "Nearest neighbor tour"
+        st.image(draw_tour(instance, tour, path_color), caption=caption)
 
 def main():
     st.title("Traveling Salesman Problem Simulation")
 
     st.sidebar.header("Graph Settings")
-    num_nodes = st.sidebar.slider("Number of Nodes", 3, 10, 6)
+    num_nodes = st.sidebar.slider("Number of Nodes", 3, 30, 6)
     max_weight = st.sidebar.slider("Maximum Edge Weight", 1, 10, 5)
     zoom_level = st.sidebar.slider("Zoom Level", 0.5, 3.0, 1.0, 0.1)
 
@@ -126,27 +109,56 @@ def main():
     st.sidebar.header("Traveling Salesman Problem")
     start_node = st.sidebar.selectbox("Starting Node", nodes)
 
-    if st.sidebar.button("Find TSP Path"):
+    find_path = st.sidebar.button("Find TSP Path")
+    find_improved = st.sidebar.button("Find Improved TSP Path")
+    if find_path:
         path, total_distance = graph.nearest_neighbor_tsp(start_node)
         st.session_state.path = path
         st.session_state.total_distance = total_distance
         st.sidebar.success(f"TSP Path: {' -> '.join(path)}")
         st.sidebar.info(f"Total Distance: {total_distance}")
+    elif find_improved:
+        path, heuristic_distance = graph.nearest_neighbor_tsp(start_node)
+        instance, names = TSPInstance.from_graph(graph)
+        start = names.index(start_node)
+        tour = local_search(instance, nearest_neighbor_tour(instance, start))
+        cycle = [names[i] for i in tour[:-1]]
+        offset = cycle.index(start_node)
+        path = cycle[offset:] + cycle[:offset] + [start_node]
+        total_distance = sum(graph.edges[a][b] for a, b in zip(path, path[1:]))
+        st.session_state.path = path
+        st.session_state.total_distance = total_distance
+        st.sidebar.success(f"TSP Path: {' -> '.join(path)}")
+        st.sidebar.info(f"Total Distance: {total_distance} (nearest neighbor alone: {heuristic_distance})")
     else:
         st.session_state.path = []
         st.session_state.total_distance = 0
 
-    dot = graph.get_graphviz(bg_color, box_color, node_color, edge_color, path_color, zoom_level, st.session_state.path)
-
-    png_data = dot.pipe(format='png')
-    st.image(png_data, caption="Traveling Salesman Problem Graph", use_column_width=True)
-
-    st.download_button(
-        label="Download Graph as PNG",
-        data=png_data,
-        file_name="tsp_graph.png",
-        mime="image/png"
-    )
+    st.sidebar.header("Exact Solver")
+    time_budget = st.sidebar.slider("Branch and Bound Time Budget (s)", 1, 60, 5)
+    if st.sidebar.button("Find Optimal Tour"):
+        _, heuristic_distance = graph.nearest_neighbor_tsp(start_node)
+        instance, names = TSPInstance.from_graph(graph)
+        start = time.perf_counter()
+        tour, total_distance, optimal, method = solve_exact(instance, time_budget)
+        elapsed = time.perf_counter() - start
+        # Rotate the closed tour so it starts at the chosen node
+        cycle = [names[i] for i in tour[:-1]]
+        offset = cycle.index(start_node)
+        path = cycle[offset:] + cycle[:offset] + [start_node]
+        st.session_state.path = path
+        st.session_state.total_distance = total_distance
+        label = "Optimal" if optimal else "Best Found"
+        st.sidebar.success(f"{label} Path: {' -> '.join(path)}")
+        st.sidebar.info(f"Total Distance: {total_distance:g}")
+        gap = (heuristic_distance - total_distance) / total_distance if total_distance else 0.0
+        st.sidebar.metric(f"Nearest Neighbor Gap to {label}", f"{gap:.1%}")
+        st.sidebar.metric("Solve Time", f"{elapsed:.3f} s")
+        st.sidebar.caption(method if optimal else f"{method} stopped at the time budget")
+
+    dot = show_graph(graph, lambda: graph.get_graphviz(bg_color, box_color, node_color, edge_color, path_color,
+                                                        zoom_level, st.session_state.path, graph.positions),
+                     "Traveling Salesman Problem Graph", "tsp_graph.png")
 
     tab1, tab2 = st.tabs(["Graphviz DOT", "Mermaid"])
 
@@ -159,5 +171,7 @@ def main():
         mermaid_code = graph.get_mermaid(st.session_state.path)
         st.code(mermaid_code, language="mermaid")
 
+    show_large_instance(path_color)
+
 if __name__ == "__main__":
     main()
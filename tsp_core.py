@@ -0,0 +1,165 @@
+import numpy as np
+
+EUCLIDEAN_TYPES = ('EUC_2D', 'CEIL_2D', 'ATT')
+
+
+def node_name(i):
+    # A..Z, then AA, AB, ... like spreadsheet columns
+    name = ''
+    i += 1
+    while i:
+        i, rem = divmod(i - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+
+class TSPInstance:
+    # Cities are integer ids 0..n-1. Either a full distance matrix is stored,
+    # or only coordinates, in which case each row is computed when needed so
+    # large instances never materialize an n x n array.
+    def __init__(self, coords=None, matrix=None, weight_type='EUC', name=''):
+        if coords is None and matrix is None:
+            raise ValueError("TSPInstance needs coordinates or a distance matrix")
+        self.coords = None if coords is None else np.asarray(coords, dtype=np.float64)
+        self.matrix = None if matrix is None else np.asarray(matrix, dtype=np.float64)
+        self.weight_type = weight_type
+        self.name = name
+
+    def __len__(self):
+        return len(self.matrix) if self.matrix is not None else len(self.coords)
+
+    def _metric(self, delta):
+        if self.weight_type == 'ATT':
+            return np.ceil(np.sqrt((delta ** 2).sum(axis=-1) / 10.0))
+        dist = np.hypot(delta[..., 0], delta[..., 1])
+        if self.weight_type == 'EUC_2D':
+            return np.floor(dist + 0.5)
+        if self.weight_type == 'CEIL_2D':
+            return np.ceil(dist)
+        return dist
+
+    def row(self, i):
+        if self.matrix is not None:
+            return self.matrix[i]
+        return self._metric(self.coords - self.coords[i])
+
+    def pair_distances(self, a, b):
+        # Distances between cities a[k] and b[k] for index arrays a and b
+        if self.matrix is not None:
+            return self.matrix[a, b]
+        return self._metric(self.coords[a] - self.coords[b])
+
+    def full_matrix(self):
+        if self.matrix is None:
+            self.matrix = np.vstack([self.row(i) for i in range(len(self))])
+        return self.matrix
+
+    @classmethod
+    def from_graph(cls, graph):
+        names = list(graph.nodes)
+        index = {name: i for i, name in enumerate(names)}
+        matrix = np.full((len(names), len(names)), np.inf)
+        np.fill_diagonal(matrix, 0)
+        for start, ends in graph.edges.items():
+            for end, weight in ends.items():
+                matrix[index[start], index[end]] = weight
+        return cls(matrix=matrix), names
+
+
+def random_euclidean(n, scale=1000.0, seed=None):
+    rng = np.random.default_rng(seed)
+    return TSPInstance(coords=rng.uniform(0, scale, size=(n, 2)))
+
+
+def tour_length(instance, tour):
+    tour = np.asarray(tour)
+    return float(instance.pair_distances(tour[:-1], tour[1:]).sum())
+
+
+def nearest_neighbor_tour(instance, start=0):
+    # Closed tour starting and ending at `start`. Unvisited cities are kept
+    # packed in left[:remaining] (the chosen one is swapped with the last), so
+    # every step is one argmin over exactly the remaining candidates. With
+    # coordinates the argmin runs on squared distances, which rank the same.
+    n = len(instance)
+    left = np.delete(np.arange(n), start)
+    tour = np.empty(n + 1, dtype=np.int64)
+    tour[0] = tour[n] = current = start
+    if instance.matrix is None:
+        xs = instance.coords[left, 0].copy()
+        ys = instance.coords[left, 1].copy()
+        dx = np.empty(n)
+        dy = np.empty(n)
+    for step in range(1, n):
+        remaining = n - step
+        if instance.matrix is None:
+            x, y = instance.coords[current]
+            np.subtract(xs[:remaining], x, out=dx[:remaining])
+            np.subtract(ys[:remaining], y, out=dy[:remaining])
+            dx[:remaining] **= 2
+            dy[:remaining] **= 2
+            dx[:remaining] += dy[:remaining]
+            j = int(np.argmin(dx[:remaining]))
+        else:
+            j = int(np.argmin(instance.matrix[current, left[:remaining]]))
+        current = tour[step] = left[j]
+        last = remaining - 1
+        left[j] = left[last]
+        if instance.matrix is None:
+            xs[j], ys[j] = xs[last], ys[last]
+    return tour
+
+
+def _explicit_matrix(values, dimension, fmt):
+    matrix = np.zeros((dimension, dimension))
+    if fmt == 'FULL_MATRIX':
+        return np.asarray(values[:dimension * dimension], dtype=np.float64).reshape(dimension, dimension)
+    if fmt in ('UPPER_ROW', 'LOWER_COL'):
+        rows, cols = np.triu_indices(dimension, k=1)
+    elif fmt in ('LOWER_ROW', 'UPPER_COL'):
+        rows, cols = np.tril_indices(dimension, k=-1)
+    elif fmt in ('UPPER_DIAG_ROW', 'LOWER_DIAG_COL'):
+        rows, cols = np.triu_indices(dimension)
+    elif fmt in ('LOWER_DIAG_ROW', 'UPPER_DIAG_COL'):
+        rows, cols = np.tril_indices(dimension)
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT {fmt}")
+    matrix[rows, cols] = values[:len(rows)]
+    matrix[cols, rows] = values[:len(rows)]
+    return matrix
+
+
+def load_tsplib(lines):
+    spec = {}
+    coords = []
+    weights = []
+    section = None
+    for raw in lines:
+        line = raw.strip()
+        if not line or line == 'EOF':
+            continue
+        if line[0].isalpha():
+            # Either a "KEY : value" specification line or a section header
+            key, colon, value = line.partition(':')
+            if colon:
+                spec[key.strip().upper()] = value.strip()
+                section = None
+            else:
+                section = line.upper()
+            continue
+        if section == 'NODE_COORD_SECTION':
+            _, x, y = line.split()[:3]
+            coords.append((float(x), float(y)))
+        elif section == 'EDGE_WEIGHT_SECTION':
+            weights.extend(float(token) for token in line.split())
+    dimension = int(spec['DIMENSION'])
+    weight_type = spec.get('EDGE_WEIGHT_TYPE', 'EUC_2D').upper()
+    name = spec.get('NAME', '')
+    if weight_type == 'EXPLICIT':
+        fmt = spec.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX').upper()
+        coords = coords[:dimension] or None
+        return TSPInstance(coords=coords, matrix=_explicit_matrix(np.array(weights), dimension, fmt),
+                           weight_type=weight_type, name=name)
+    if weight_type not in EUCLIDEAN_TYPES:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE {weight_type}")
+    return TSPInstance(coords=coords[:dimension], weight_type=weight_type, name=name)
@@ -0,0 +1,117 @@
+import time
+
+import numpy as np
+
+from tsp_core import nearest_neighbor_tour, tour_length
+from tsp_local import local_search
+
+HELD_KARP_MAX_BYTES = 1 << 29
+
+
+def held_karp_bytes(n):
+    # Size of the DP table: one float64 per (subset of cities 1..n-1, last city)
+    m = max(n - 1, 0)
+    return (1 << m) * m * 8
+
+
+def _popcounts(m):
+    masks = np.arange(1 << m, dtype=np.int64)
+    counts = np.zeros(1 << m, dtype=np.int8)
+    for bit in range(m):
+        counts += (masks >> bit) & 1
+    return masks, counts
+
+
+def held_karp(instance, max_bytes=HELD_KARP_MAX_BYTES):
+    # cost[mask, j]: shortest path from city 0 through exactly the cities in
+    # mask (bit j stands for city j + 1) ending at city j + 1. Subsets are
+    # filled in order of size, one vectorized min per (size, last city).
+    n = len(instance)
+    if n < 3:
+        tour = np.array(list(range(n)) + [0])
+        return tour, tour_length(instance, tour)
+    if held_karp_bytes(n) > max_bytes:
+        raise ValueError(f"Held-Karp on {n} cities needs {held_karp_bytes(n) / 2 ** 20:.0f} MiB")
+    dist = instance.full_matrix()
+    m = n - 1
+    inner = dist[1:, 1:]
+    cost = np.full((1 << m, m), np.inf)
+    cost[1 << np.arange(m), np.arange(m)] = dist[0, 1:]
+    masks, counts = _popcounts(m)
+    for size in range(2, m + 1):
+        subsets = masks[counts == size]
+        for j in range(m):
+            ending = subsets[(subsets >> j) & 1 == 1]
+            cost[ending, j] = (cost[ending ^ (1 << j)] + inner[:, j]).min(axis=1)
+
+    # Walk back from the full set, each time finding the predecessor that
+    # produced the stored cost
+    mask = (1 << m) - 1
+    last = int(np.argmin(cost[mask] + dist[1:, 0]))
+    length = float(cost[mask, last] + dist[last + 1, 0])
+    reversed_path = [last]
+    while mask & (mask - 1):
+        previous = mask ^ (1 << last)
+        last = int(np.argmin(cost[previous] + inner[:, last]))
+        reversed_path.append(last)
+        mask = previous
+    tour = np.array([0] + [j + 1 for j in reversed(reversed_path)] + [0])
+    return tour, length
+
+
+def branch_and_bound(instance, time_budget=5.0, initial=None):
+    # Depth-first search from city 0, closest cities first. A partial tour is
+    # cut off when its cost plus the cheapest edge out of every city still to
+    # be left (the current one and all unvisited) reaches the best tour so far.
+    # Returns (tour, length, proven_optimal).
+    dist = instance.full_matrix()
+    n = len(dist)
+    best_tour = nearest_neighbor_tour(instance) if initial is None else np.asarray(initial)
+    best = [tour_length(instance, best_tour), list(best_tour)]
+    cheapest = np.where(np.eye(n, dtype=bool), np.inf, dist).min(axis=1)
+    order = [[int(j) for j in np.argsort(dist[i]) if j != i] for i in range(n)]
+    deadline = time.perf_counter() + time_budget
+    visited = [False] * n
+    visited[0] = True
+    path = [0]
+    expanded = [0]
+
+    def search(current, cost, bound):
+        expanded[0] += 1
+        if expanded[0] % 1024 == 0 and time.perf_counter() > deadline:
+            raise TimeoutError
+        if len(path) == n:
+            total = cost + dist[current, 0]
+            if total < best[0]:
+                best[0], best[1] = total, path + [0]
+            return
+        bound -= cheapest[current]
+        for nxt in order[current]:
+            if visited[nxt]:
+                continue
+            step = cost + dist[current, nxt]
+            if step + bound >= best[0]:
+                continue
+            visited[nxt] = True
+            path.append(nxt)
+            search(nxt, step, bound)
+            path.pop()
+            visited[nxt] = False
+
+    try:
+        search(0, 0.0, float(cheapest.sum()))
+        optimal = True
+    except TimeoutError:
+        optimal = False
+    return np.array(best[1]), float(best[0]), optimal
+
+
+def solve_exact(instance, time_budget=5.0, max_bytes=HELD_KARP_MAX_BYTES):
+    # Held-Karp while its table fits in max_bytes, branch and bound beyond.
+    # Returns (tour, length, proven_optimal, method).
+    if held_karp_bytes(len(instance)) <= max_bytes:
+        tour, length = held_karp(instance, max_bytes)
+        return tour, length, True, "Held-Karp"
+    initial = local_search(instance, nearest_neighbor_tour(instance))
+    tour, length, optimal = branch_and_bound(instance, time_budget, initial)
+    return tour, length, optimal, "Branch and bound"
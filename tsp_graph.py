@@ -0,0 +1,96 @@
+import random
+
+from graphviz import Digraph
+
+from graph_layout import pinned
+from tsp_core import TSPInstance, nearest_neighbor_tour, node_name
+
+
+class Node:
+    def __init__(self, name):
+        self.name = name
+
+
+class Graph:
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        self.positions = None
+
+    def add_node(self, name):
+        self.nodes[name] = Node(name)
+        self.positions = None
+
+    def add_edge(self, start, end, weight):
+        self.positions = None
+        if start not in self.edges:
+            self.edges[start] = {}
+        self.edges[start][end] = weight
+        if end not in self.edges:
+            self.edges[end] = {}
+        self.edges[end][start] = weight  # Make the graph undirected
+
+    def get_graphviz(self, bg_color, box_color, node_color, edge_color, path_color, zoom_level, path=None, positions=None):
+        dot = Digraph(comment='Traveling Salesman Problem Visualization')
+        dot.engine = 'neato'
+        
+        width, height = 22 * zoom_level, 17 * zoom_level
+        size = f"{width},{height}"
+        dot.attr(rankdir='LR', bgcolor=bg_color, size=size, dpi="60")
+        
+        with dot.subgraph(name='cluster_bg') as c:
+            c.attr(style='filled,rounded', color=box_color, fillcolor=box_color, penwidth='2')
+            c.attr(label='', fontcolor="#00000000")
+
+        node_size = max(0.3, 0.8 / zoom_level)
+        dot.attr('node', shape='circle', style='filled', fontcolor='black', fontname='Arial', 
+                 fontsize=str(max(10, int(20 / zoom_level))), width=str(node_size), height=str(node_size), fixedsize='true')
+        
+        edge_len = max(1.0, 2.0 * zoom_level)
+        dot.attr('edge', fontname='Arial', fontsize=str(max(8, int(16 / zoom_level))), len=str(edge_len))
+
+        for name in self.nodes:
+            pin = {'pos': pinned(positions[name], zoom_level)} if positions else {}
+            dot.node(name, name, fillcolor=node_color, **pin)
+
+        for start, ends in self.edges.items():
+            for end, weight in ends.items():
+                if path and start in path and end in path and (path.index(end) == path.index(start) + 1 or path.index(start) == path.index(end) + 1):
+                    dot.edge(start, end, label=str(weight), color=path_color, penwidth='3', dir='both')
+                else:
+                    dot.edge(start, end, label=str(weight), color=edge_color, penwidth='2', dir='both')
+
+        return dot
+
+    def get_mermaid(self, path=None):
+        mermaid_code = ["graph LR"]
+        for start, ends in self.edges.items():
+            for end, weight in ends.items():
+                if path and start in path and end in path and (path.index(end) == path.index(start) + 1 or path.index(start) == path.index(end) + 1):
+                    mermaid_code.append(f"    {start}-->{end}")
+                    mermaid_code.append(f"    style {start} fill:#ff0000")
+                    mermaid_code.append(f"    style {end} fill:#ff0000")
+                else:
+                    mermaid_code.append(f"    {start}--{weight}-->{end}")
+        return "\n".join(mermaid_code)
+
+    def nearest_neighbor_tsp(self, start):
+        instance, names = TSPInstance.from_graph(self)
+        tour = nearest_neighbor_tour(instance, names.index(start))
+        path = [names[i] for i in tour]
+        total_distance = sum(self.edges[a][b] for a, b in zip(path, path[1:]))
+        return path, total_distance
+
+
+def create_random_graph(num_nodes, max_weight):
+    graph = Graph()
+    nodes = [node_name(i) for i in range(num_nodes)]
+    for node in nodes:
+        graph.add_node(node)
+    
+    for i in range(num_nodes):
+        for j in range(i+1, num_nodes):
+            weight = random.randint(1, max_weight)
+            graph.add_edge(nodes[i], nodes[j], weight)
+    
+    return graph
@@ -0,0 +1,246 @@
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from tsp_core import nearest_neighbor_tour, tour_length
+
+EPSILON = 1e-9
+
+
+def distance_function(instance):
+    # Scalar distance lookups; the local search makes millions of these and
+    # plain Python floats beat indexing NumPy arrays one element at a time
+    if instance.matrix is not None:
+        rows = instance.matrix.tolist()
+        return lambda i, j: rows[i][j]
+    xs = instance.coords[:, 0].tolist()
+    ys = instance.coords[:, 1].tolist()
+    if instance.weight_type == 'EUC_2D':
+        return lambda i, j: math.floor(math.hypot(xs[i] - xs[j], ys[i] - ys[j]) + 0.5)
+    if instance.weight_type == 'CEIL_2D':
+        return lambda i, j: math.ceil(math.hypot(xs[i] - xs[j], ys[i] - ys[j]))
+    if instance.weight_type == 'ATT':
+        return lambda i, j: math.ceil(math.hypot(xs[i] - xs[j], ys[i] - ys[j]) / math.sqrt(10.0))
+    return lambda i, j: math.hypot(xs[i] - xs[j], ys[i] - ys[j])
+
+
+def neighbor_lists(instance, k=8, chunk_size=512):
+    # The k nearest cities of every city, closest first, computed a block of
+    # rows at a time so coordinate instances never build the full matrix
+    n = len(instance)
+    k = min(k, n - 1)
+    neighbors = np.empty((n, k), dtype=np.int64)
+    for lo in range(0, n, chunk_size):
+        hi = min(n, lo + chunk_size)
+        if instance.matrix is not None:
+            block = instance.matrix[lo:hi].copy()
+        else:
+            # Squared Euclidean distance ranks cities the same as every coordinate metric
+            xs, ys = instance.coords[:, 0], instance.coords[:, 1]
+            block = (xs[lo:hi, None] - xs) ** 2 + (ys[lo:hi, None] - ys) ** 2
+        block[np.arange(hi - lo), np.arange(lo, hi)] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1)
+        neighbors[lo:hi] = np.take_along_axis(nearest, order, axis=1)
+    return neighbors
+
+
+class _Tour:
+    # Cyclic tour as an order array plus each city's position in it
+    def __init__(self, tour):
+        self.order = [int(city) for city in tour[:-1]]
+        self.pos = [0] * len(self.order)
+        for i, city in enumerate(self.order):
+            self.pos[city] = i
+        self.n = len(self.order)
+
+    def next(self, city):
+        return self.order[(self.pos[city] + 1) % self.n]
+
+    def prev(self, city):
+        return self.order[(self.pos[city] - 1) % self.n]
+
+    def reverse(self, first, last):
+        # Reverse the path first..last; reversing the rest of the cycle gives
+        # the same undirected tour, so the shorter side is done
+        order, pos, n = self.order, self.pos, self.n
+        i, j = pos[first], pos[last]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            a, b = order[i], order[j]
+            order[i], order[j] = b, a
+            pos[a], pos[b] = j, i
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def move(self, x1, x2, y1, y2):
+        # Replace edges (x1, x2) and (y1, y2), met in that order along the
+        # tour in either direction, by (x1, y1) and (x2, y2)
+        if self.next(x1) == x2:
+            self.reverse(x2, y1)
+        else:
+            self.reverse(y1, x2)
+
+    def closed(self):
+        start = self.pos[0]
+        return np.array(self.order[start:] + self.order[:start] + [0])
+
+
+def _improve_two_opt(tour, dist, neighbors, a):
+    for forward in (True, False):
+        b = tour.next(a) if forward else tour.prev(a)
+        d_ab = dist(a, b)
+        for c in neighbors[a]:
+            d_ac = dist(a, c)
+            if d_ac >= d_ab:
+                break
+            d = tour.next(c) if forward else tour.prev(c)
+            if c == b or d == a:
+                continue
+            delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+            if delta < -EPSILON:
+                if forward:
+                    tour.move(a, b, c, d)
+                else:
+                    tour.move(b, a, d, c)
+                return (a, b, c, d)
+    return None
+
+
+def _improve_or_opt(tour, dist, neighbors, s1, max_segment=3):
+    # Move the segment of 1..max_segment cities starting at s1 between a
+    # neighbour c and the city after it, in whichever orientation is shorter
+    for length in range(1, max_segment + 1):
+        if length + 2 >= tour.n:
+            break
+        segment = [s1]
+        for _ in range(length - 1):
+            segment.append(tour.next(segment[-1]))
+        s2 = segment[-1]
+        a, b = tour.prev(s1), tour.next(s2)
+        removed = dist(a, s1) + dist(s2, b) - dist(a, b)
+        if removed <= EPSILON:
+            continue
+        inside = set(segment)
+        for c in set(neighbors[s1]) | set(neighbors[s2]):
+            if c in inside:
+                continue
+            for c1, c2 in ((c, tour.next(c)), (tour.prev(c), c)):
+                if c2 in inside or c1 in inside or c1 == a or c2 == a:
+                    continue
+                cut = dist(c1, c2)
+                reversed_gain = removed - (dist(c1, s2) + dist(s1, c2) - cut)
+                forward_gain = removed - (dist(c1, s1) + dist(s2, c2) - cut)
+                if max(reversed_gain, forward_gain) <= EPSILON:
+                    continue
+                # Two 2-opt moves insert the segment reversed between c1 and c2
+                tour.move(a, s1, c1, c2)
+                tour.move(a, c1, b, s2)
+                if forward_gain > reversed_gain:
+                    tour.move(c1, s2, s1, c2)
+                return (a, b, c1, c2, s1, s2)
+    return None
+
+
+def local_search(instance, tour, neighbors=None, k=8, deadline=None, or_opt=True, dist=None):
+    # 2-opt and Or-opt driven by neighbour lists. Cities whose surroundings
+    # have not changed since they last failed to improve are skipped
+    # (don't-look bits); only the endpoints of a move are queued again.
+    # Returns the improved closed tour; stops early at `deadline`
+    # (a time.perf_counter() value) with the best tour reached so far.
+    n = len(instance)
+    if n < 5:
+        return np.asarray(tour)
+    dist = dist or distance_function(instance)
+    if neighbors is None:
+        neighbors = neighbor_lists(instance, k)
+    neighbors = neighbors.tolist() if isinstance(neighbors, np.ndarray) else neighbors
+    current = _Tour(tour)
+    queue = deque(current.order)
+    queued = [True] * n
+    while queue:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        city = queue.popleft()
+        queued[city] = False
+        changed = _improve_two_opt(current, dist, neighbors, city)
+        if changed is None and or_opt:
+            changed = _improve_or_opt(current, dist, neighbors, city)
+        if changed is None:
+            continue
+        for touched in (city,) + changed:
+            if not queued[touched]:
+                queued[touched] = True
+                queue.append(touched)
+    return current.closed()
+
+
+_worker_state = {}
+
+
+def _init_worker(instance, neighbors):
+    _worker_state['instance'] = instance
+    _worker_state['neighbors'] = neighbors.tolist()
+    _worker_state['dist'] = distance_function(instance)
+
+
+def _improve_from(start, wall_deadline):
+    # The deadline crosses the process boundary as wall-clock time
+    instance = _worker_state['instance']
+    deadline = time.perf_counter() + (wall_deadline - time.time())
+    tour = nearest_neighbor_tour(instance, start)
+    greedy = tour_length(instance, tour)
+    tour = local_search(instance, tour, _worker_state['neighbors'], deadline=deadline, dist=_worker_state['dist'])
+    return start, tour, greedy, tour_length(instance, tour)
+
+
+def multi_start(instance, time_budget=10.0, starts=None, workers=None, k=8):
+    # Nearest neighbour from every start city (or those given), each improved
+    # by local_search in a process pool, until the time budget runs out.
+    # Returns (best_tour, best_length, curve, completed) where curve holds
+    # (seconds, best length so far) each time a start improves on it, after
+    # the plain nearest neighbour length of the first start.
+    began = time.perf_counter()
+    deadline = began + time_budget
+    wall_deadline = time.time() + time_budget
+    starts = list(range(len(instance)) if starts is None else starts)
+    workers = workers or os.cpu_count() or 1
+    neighbors = neighbor_lists(instance, k)
+    best_tour, best_length, curve, completed = None, math.inf, [], 0
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(instance, neighbors)) as pool:
+        while starts or pending:
+            # Keep a couple of starts queued per worker rather than all n
+            while starts and len(pending) < 2 * workers and time.perf_counter() < deadline:
+                pending.add(pool.submit(_improve_from, starts.pop(0), wall_deadline))
+            if not pending:
+                break
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()) + 1.0,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                _, tour, greedy, length = future.result()
+                completed += 1
+                if not curve:
+                    curve.append((time.perf_counter() - began, greedy))
+                if length < best_length - EPSILON:
+                    best_tour, best_length = tour, length
+                    curve.append((time.perf_counter() - began, length))
+            if time.perf_counter() > deadline:
+                starts = []
+                for future in pending:
+                    future.cancel()
+    if best_tour is None:
+        best_tour = nearest_neighbor_tour(instance)
+        best_length = tour_length(instance, best_tour)
+        curve.append((time.perf_counter() - began, best_length))
+    return best_tour, best_length, curve, completed